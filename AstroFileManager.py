@@ -205,8 +205,16 @@ class XISFCatalogGUI(QMainWindow):
         self.connect_signals()
     
     def closeEvent(self, event: Any) -> None:
-        """Save settings when closing"""
+        """Save settings and tidy up the database when closing"""
         self.save_settings()
+        try:
+            self.db.maintenance()
+        except Exception:
+            # Never block shutdown on housekeeping
+            pass
+        # Release the pooled project database connections
+        self.projects_tab.project_manager.close()
+        self.view_tab.project_manager.close()
         event.accept()
     
     def on_tab_changed(self, index: int) -> None:
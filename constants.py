@@ -26,3 +26,7 @@ MIN_FRAMES_ACCEPTABLE = 10      # Acceptable minimum frames
 # Import settings
 IMPORT_BATCH_SIZE = 50          # Number of files to process in a batch
 DATE_OFFSET_HOURS = 12          # Hours to subtract for date normalization
+
+# Database settings
+FETCH_BATCH_SIZE = 10000        # Rows fetched per round-trip when streaming results
+MAINTENANCE_ROW_THRESHOLD = 1000  # Inserted rows that trigger a WAL checkpoint + optimize
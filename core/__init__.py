@@ -10,7 +10,9 @@ This package contains the core business logic separated from UI concerns:
 
 from .database import DatabaseManager
 from .calibration import CalibrationMatcher
-from .project_manager import ProjectManager, Project, FilterGoalProgress
+from .project_manager import (
+    ProjectManager, AsyncProjectManager, Project, FilterGoalProgress
+)
 from .project_templates import (
     ProjectTemplate, FilterGoal, get_templates,
     get_template_by_name, create_filter_goals_dict,
@@ -19,7 +21,7 @@ from .project_templates import (
 
 __all__ = [
     'DatabaseManager', 'CalibrationMatcher',
-    'ProjectManager', 'Project', 'FilterGoalProgress',
+    'ProjectManager', 'AsyncProjectManager', 'Project', 'FilterGoalProgress',
     'ProjectTemplate', 'FilterGoal', 'get_templates',
     'get_template_by_name', 'create_filter_goals_dict',
     'NARROWBAND_TEMPLATE', 'BROADBAND_TEMPLATE', 'CUSTOM_TEMPLATE'
@@ -78,7 +78,7 @@ class CalibrationMatcher:
             query = f'''
                 SELECT COUNT(*), AVG(ccd_temp)
                 FROM xisf_files
-                WHERE imagetyp LIKE '%Dark%'
+                WHERE frame_kind = 'D'
                     AND imagetyp NOT LIKE '%Master%'
                     AND ABS(exposure - ?) < {self.exposure_tolerance}
                     AND ccd_temp BETWEEN ? AND ?
@@ -89,8 +89,8 @@ class CalibrationMatcher:
 
             # Add instrument matching if provided
             if instrument is not None:
-                query += ' AND (instrume = ? OR (instrume IS NULL AND ? IS NULL))'
-                params.extend([instrument, instrument])
+                query += ' AND instrume IS ?'
+                params.append(instrument)
 
             cursor.execute(query, params)
 
@@ -104,7 +104,7 @@ class CalibrationMatcher:
                     SELECT COUNT(*)
                     FROM xisf_files
                     WHERE imagetyp LIKE '%Master%'
-                        AND imagetyp LIKE '%Dark%'
+                        AND frame_kind = 'D'
                         AND ABS(exposure - ?) < {self.exposure_tolerance}
                         AND ccd_temp BETWEEN ? AND ?
                         AND xbinning = ?
@@ -114,8 +114,8 @@ class CalibrationMatcher:
 
                 # Add instrument matching if provided
                 if instrument is not None:
-                    query += ' AND (instrume = ? OR (instrume IS NULL AND ? IS NULL))'
-                    params.extend([instrument, instrument])
+                    query += ' AND instrume IS ?'
+                    params.append(instrument)
 
                 cursor.execute(query, params)
 
@@ -178,7 +178,7 @@ class CalibrationMatcher:
             query = '''
                 SELECT COUNT(*), AVG(ccd_temp)
                 FROM xisf_files
-                WHERE imagetyp LIKE '%Bias%'
+                WHERE frame_kind = 'B'
                     AND imagetyp NOT LIKE '%Master%'
                     AND ccd_temp BETWEEN ? AND ?
                     AND xbinning = ?
@@ -188,8 +188,8 @@ class CalibrationMatcher:
 
             # Add instrument matching if provided
             if instrument is not None:
-                query += ' AND (instrume = ? OR (instrume IS NULL AND ? IS NULL))'
-                params.extend([instrument, instrument])
+                query += ' AND instrume IS ?'
+                params.append(instrument)
 
             cursor.execute(query, params)
 
@@ -203,7 +203,7 @@ class CalibrationMatcher:
                     SELECT COUNT(*)
                     FROM xisf_files
                     WHERE imagetyp LIKE '%Master%'
-                        AND imagetyp LIKE '%Bias%'
+                        AND frame_kind = 'B'
                         AND ccd_temp BETWEEN ? AND ?
                         AND xbinning = ?
                         AND ybinning = ?
@@ -212,8 +212,8 @@ class CalibrationMatcher:
 
                 # Add instrument matching if provided
                 if instrument is not None:
-                    query += ' AND (instrume = ? OR (instrume IS NULL AND ? IS NULL))'
-                    params.extend([instrument, instrument])
+                    query += ' AND instrume IS ?'
+                    params.append(instrument)
 
                 cursor.execute(query, params)
 
@@ -278,20 +278,20 @@ class CalibrationMatcher:
             query = '''
                 SELECT COUNT(*), AVG(ccd_temp)
                 FROM xisf_files
-                WHERE imagetyp LIKE '%Flat%'
+                WHERE frame_kind = 'F'
                     AND imagetyp NOT LIKE '%Master%'
-                    AND (filter = ? OR (filter IS NULL AND ? IS NULL))
+                    AND filter IS ?
                     AND ccd_temp BETWEEN ? AND ?
                     AND xbinning = ?
                     AND ybinning = ?
                     AND date_loc = ?
             '''
-            params = [filter_name, filter_name, temp_min, temp_max, xbin, ybin, session_date]
+            params = [filter_name, temp_min, temp_max, xbin, ybin, session_date]
 
             # Add instrument matching if provided
             if instrument is not None:
-                query += ' AND (instrume = ? OR (instrume IS NULL AND ? IS NULL))'
-                params.extend([instrument, instrument])
+                query += ' AND instrume IS ?'
+                params.append(instrument)
 
             cursor.execute(query, params)
 
@@ -305,19 +305,19 @@ class CalibrationMatcher:
                     SELECT COUNT(*)
                     FROM xisf_files
                     WHERE imagetyp LIKE '%Master%'
-                        AND imagetyp LIKE '%Flat%'
-                        AND (filter = ? OR (filter IS NULL AND ? IS NULL))
+                        AND frame_kind = 'F'
+                        AND filter IS ?
                         AND ccd_temp BETWEEN ? AND ?
                         AND xbinning = ?
                         AND ybinning = ?
                         AND date_loc = ?
                 '''
-                params = [filter_name, filter_name, temp_min, temp_max, xbin, ybin, session_date]
+                params = [filter_name, temp_min, temp_max, xbin, ybin, session_date]
 
                 # Add instrument matching if provided
                 if instrument is not None:
-                    query += ' AND (instrume = ? OR (instrume IS NULL AND ? IS NULL))'
-                    params.extend([instrument, instrument])
+                    query += ' AND instrume IS ?'
+                    params.append(instrument)
 
                 cursor.execute(query, params)
 
@@ -447,7 +447,7 @@ class CalibrationMatcher:
                     SUM(CASE WHEN imagetyp LIKE '%Master%' THEN 1 ELSE 0 END) as master_count,
                     AVG(ccd_temp) as avg_temp
                 FROM xisf_files
-                WHERE imagetyp LIKE '%Dark%'
+                WHERE frame_kind = 'D'
                 GROUP BY ROUND(exposure, 1), ROUND(ccd_temp, 0), xbinning, ybinning, instrume
             ''')
 
@@ -471,7 +471,7 @@ class CalibrationMatcher:
                     SUM(CASE WHEN imagetyp LIKE '%Master%' THEN 1 ELSE 0 END) as master_count,
                     AVG(ccd_temp) as avg_temp
                 FROM xisf_files
-                WHERE imagetyp LIKE '%Bias%'
+                WHERE frame_kind = 'B'
                 GROUP BY ROUND(ccd_temp, 0), xbinning, ybinning, instrume
             ''')
 
@@ -497,7 +497,7 @@ class CalibrationMatcher:
                     SUM(CASE WHEN imagetyp LIKE '%Master%' THEN 1 ELSE 0 END) as master_count,
                     AVG(ccd_temp) as avg_temp
                 FROM xisf_files
-                WHERE imagetyp LIKE '%Flat%'
+                WHERE frame_kind = 'F'
                 GROUP BY filter, date_loc, ROUND(ccd_temp, 0), xbinning, ybinning, instrume
             ''')
 
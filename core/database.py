@@ -9,8 +9,67 @@ import sqlite3
 import shutil
 import os
 from datetime import datetime
-from contextlib import contextmanager
-from typing import Optional, List, Dict, Tuple, Any
+from contextlib import contextmanager, suppress
+from types import MappingProxyType
+from typing import Optional, List, Dict, Tuple, Any, Iterator
+
+from constants import FETCH_BATCH_SIZE, MAINTENANCE_ROW_THRESHOLD
+from core.project_manager import ProjectManager
+from utils.db_schema import ensure_schema
+
+# Map FITS keywords to the editable database columns
+_FITS_TO_COL = MappingProxyType({
+    'TELESCOP': 'telescop',
+    'INSTRUME': 'instrume',
+    'OBJECT': 'object',
+    'FILTER': 'filter',
+    'IMAGETYP': 'imagetyp'
+})
+
+# Chunk size for the kernel-side file copy used by backups
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def _copy_file_uncached(src: str, dst: str) -> None:
+    """
+    Copy a file without leaving its pages in the OS page cache.
+
+    A plain copy of a large database evicts the pages the running application
+    is using. On Linux the data is copied kernel-side with os.sendfile and
+    both files are then dropped from the page cache with posix_fadvise.
+    Other platforms fall back to shutil.copy2. File metadata is preserved in
+    both cases.
+
+    Args:
+        src: Source file path
+        dst: Destination file path
+    """
+    if not (hasattr(os, 'sendfile') and hasattr(os, 'posix_fadvise')):
+        shutil.copy2(src, dst)
+        return
+
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            offset = 0
+            size = os.fstat(src_fd).st_size
+            while offset < size:
+                sent = os.sendfile(dst_fd, src_fd, offset, _COPY_CHUNK_SIZE)
+                if sent == 0:
+                    break
+                offset += sent
+
+            # Flush before advising, otherwise dirty pages cannot be dropped
+            os.fsync(dst_fd)
+            os.posix_fadvise(src_fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            os.posix_fadvise(dst_fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+    shutil.copystat(src, dst)
 
 
 class DatabaseManager:
@@ -24,6 +83,30 @@ class DatabaseManager:
             db_path: Path to SQLite database file
         """
         self.db_path = db_path
+        self._schema_checked = False
+
+        # Prebuilt SQL for the editable keyword columns. Only these columns are
+        # ever interpolated into SQL, and the statement text stays constant per
+        # column so sqlite3's statement cache can reuse the prepared statement.
+        keyword_columns = tuple(_FITS_TO_COL.values())
+        self._distinct_sql = {
+            column: f'''
+                SELECT {column}
+                FROM xisf_files
+                WHERE {column} IS NOT NULL
+                GROUP BY {column}
+                ORDER BY {column}
+            '''
+            for column in keyword_columns
+        }
+        self._replace_sql = {
+            column: f'''
+                UPDATE xisf_files
+                SET {column} = ?
+                WHERE {column} = ?
+            '''
+            for column in keyword_columns
+        }
 
     @contextmanager
     def get_connection(self):
@@ -46,6 +129,14 @@ class DatabaseManager:
         cursor.execute('PRAGMA cache_size=-64000')  # 64MB cache
         cursor.execute('PRAGMA mmap_size=268435456')  # 256MB memory-mapped I/O
         cursor.execute('PRAGMA synchronous=NORMAL')  # Faster writes, still safe with WAL
+        cursor.execute('PRAGMA temp_store=MEMORY')  # Keep sort/DISTINCT temp b-trees in RAM
+        cursor.execute('PRAGMA foreign_keys=ON')  # Cascade file deletes to project links
+
+        # Bring older databases up to date once per manager instance
+        if not self._schema_checked:
+            ensure_schema(cursor)
+            conn.commit()
+            self._schema_checked = True
 
         try:
             yield conn
@@ -56,6 +147,20 @@ class DatabaseManager:
         finally:
             conn.close()
 
+    def maintenance(self) -> None:
+        """
+        Checkpoint the WAL and refresh query planner statistics.
+
+        Truncates the write-ahead log so readers do not have to walk a long
+        WAL index, and runs PRAGMA optimize so the planner statistics reflect
+        the current data. Cheap enough to run after large imports and on
+        application shutdown.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            cursor.execute('PRAGMA optimize')
+
     def get_catalog_statistics(self) -> Dict[str, Any]:
         """
         Get catalog summary statistics.
@@ -75,7 +180,7 @@ class DatabaseManager:
             cursor.execute('''
                 SELECT SUM(exposure) / 3600.0
                 FROM xisf_files
-                WHERE imagetyp LIKE '%Light%'
+                WHERE is_light = 1
             ''')
             total_exposure = cursor.fetchone()[0] or 0.0
 
@@ -87,15 +192,18 @@ class DatabaseManager:
             ''')
             unique_objects = cursor.fetchone()[0]
 
-            # Frame type breakdown
-            frame_counts = {}
-            for frame_type in ['Light', 'Dark', 'Flat', 'Bias']:
-                cursor.execute(f'''
-                    SELECT COUNT(*)
-                    FROM xisf_files
-                    WHERE imagetyp LIKE '%{frame_type}%'
-                ''')
-                frame_counts[frame_type.lower()] = cursor.fetchone()[0]
+            # Frame type breakdown in one pass. Lights use the generated
+            # is_light column; dark/flat/bias keep their substring matches,
+            # so a frame whose type names several kinds counts for each.
+            cursor.execute('''
+                SELECT
+                    IFNULL(SUM(is_light), 0),
+                    IFNULL(SUM(imagetyp LIKE '%Dark%'), 0),
+                    IFNULL(SUM(imagetyp LIKE '%Flat%'), 0),
+                    IFNULL(SUM(imagetyp LIKE '%Bias%'), 0)
+                FROM xisf_files
+            ''')
+            frame_counts = dict(zip(('light', 'dark', 'flat', 'bias'), cursor.fetchone()))
 
             # Date range
             cursor.execute('''
@@ -170,10 +278,12 @@ class DatabaseManager:
         """
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            # GROUP BY lets SQLite walk idx_object instead of sorting a temp b-tree
             cursor.execute('''
-                SELECT DISTINCT object
+                SELECT object
                 FROM xisf_files
                 WHERE object IS NOT NULL
+                GROUP BY object
                 ORDER BY object
             ''')
             return [row[0] for row in cursor.fetchall()]
@@ -238,6 +348,10 @@ class DatabaseManager:
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
             ''', file_data)
 
+        # Large imports grow the WAL and change the data distribution
+        if len(file_data) >= MAINTENANCE_ROW_THRESHOLD:
+            self.maintenance()
+
     def delete_file_by_filename(self, filename: str) -> None:
         """
         Delete a file from the database by filename.
@@ -255,6 +369,24 @@ class DatabaseManager:
             cursor = conn.cursor()
             cursor.execute('DELETE FROM xisf_files')
 
+    def _keyword_column(self, keyword: str) -> str:
+        """
+        Map a FITS keyword to its editable database column.
+
+        Args:
+            keyword: FITS keyword (e.g. 'OBJECT') or column name
+
+        Returns:
+            Database column name
+
+        Raises:
+            ValueError: If the keyword does not map to an editable column
+        """
+        column = _FITS_TO_COL.get(keyword, keyword.lower())
+        if column not in self._distinct_sql:
+            raise ValueError(f"Unsupported keyword: {keyword}")
+        return column
+
     def get_current_keyword_values(self, keyword: str) -> List[str]:
         """
         Get distinct current values for a keyword/column.
@@ -264,26 +396,15 @@ class DatabaseManager:
 
         Returns:
             List of distinct values
-        """
-        # Map FITS keywords to database column names
-        column_map = {
-            'TELESCOP': 'telescop',
-            'INSTRUME': 'instrume',
-            'OBJECT': 'object',
-            'FILTER': 'filter',
-            'IMAGETYP': 'imagetyp'
-        }
 
-        column = column_map.get(keyword, keyword.lower())
+        Raises:
+            ValueError: If the keyword is not an editable column
+        """
+        column = self._keyword_column(keyword)
 
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(f'''
-                SELECT DISTINCT {column}
-                FROM xisf_files
-                WHERE {column} IS NOT NULL
-                ORDER BY {column}
-            ''')
+            cursor.execute(self._distinct_sql[column])
             return [row[0] for row in cursor.fetchall()]
 
     def replace_keyword_values(self, keyword: str, old_value: str,
@@ -298,62 +419,75 @@ class DatabaseManager:
 
         Returns:
             Number of rows updated
-        """
-        # Map FITS keywords to database column names
-        column_map = {
-            'TELESCOP': 'telescop',
-            'INSTRUME': 'instrume',
-            'OBJECT': 'object',
-            'FILTER': 'filter',
-            'IMAGETYP': 'imagetyp'
-        }
 
-        column = column_map.get(keyword, keyword.lower())
+        Raises:
+            ValueError: If the keyword is not an editable column
+        """
+        column = self._keyword_column(keyword)
 
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(f'''
-                UPDATE xisf_files
-                SET {column} = ?
-                WHERE {column} = ?
-            ''', (new_value, old_value))
+            cursor.execute(self._replace_sql[column], (new_value, old_value))
             return cursor.rowcount
 
-    def get_files_for_organization(self) -> List[Tuple]:
+    def _iter_rows(self, sql: str) -> Iterator[Tuple]:
         """
-        Get all files with metadata needed for organization.
+        Stream the rows of a query in fixed-size batches.
 
-        Returns:
-            List of tuples: (filepath, filename, object, filter, imagetyp,
-                            exposure, ccd_temp, xbinning, ybinning, date_loc)
+        The connection stays open until the iterator is exhausted or closed,
+        so only one batch of rows is held in memory at a time.
+
+        Args:
+            sql: SELECT statement to run
+
+        Yields:
+            Result rows as tuples
         """
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                SELECT filepath, filename, object, filter, imagetyp,
-                       exposure, ccd_temp, xbinning, ybinning, date_loc
-                FROM xisf_files
-                ORDER BY date_loc, object, imagetyp
-            ''')
-            return cursor.fetchall()
+            cursor.arraysize = FETCH_BATCH_SIZE
+            cursor.execute(sql)
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                yield from rows
 
-    def get_files_for_organization_with_id(self) -> List[Tuple]:
+    def get_files_for_organization(self) -> Iterator[Tuple]:
+        """
+        Get all files with metadata needed for organization.
+
+        Rows are streamed in batches; wrap the result in list() if the
+        whole result set is needed at once.
+
+        Yields:
+            Tuples: (filepath, filename, object, filter, imagetyp,
+                     exposure, ccd_temp, xbinning, ybinning, date_loc)
+        """
+        yield from self._iter_rows('''
+            SELECT filepath, filename, object, filter, imagetyp,
+                   exposure, ccd_temp, xbinning, ybinning, date_loc
+            FROM xisf_files
+            ORDER BY date_loc, object, imagetyp
+        ''')
+
+    def get_files_for_organization_with_id(self) -> Iterator[Tuple]:
         """
         Get all files with ID for organization execution.
 
-        Returns:
-            List of tuples: (id, filepath, filename, object, filter, imagetyp,
-                            exposure, ccd_temp, xbinning, ybinning, date_loc)
+        Rows are streamed in batches; wrap the result in list() if the
+        whole result set is needed at once.
+
+        Yields:
+            Tuples: (id, filepath, filename, object, filter, imagetyp,
+                     exposure, ccd_temp, xbinning, ybinning, date_loc)
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT id, filepath, filename, object, filter, imagetyp,
-                       exposure, ccd_temp, xbinning, ybinning, date_loc
-                FROM xisf_files
-                ORDER BY date_loc, object, imagetyp
-            ''')
-            return cursor.fetchall()
+        yield from self._iter_rows('''
+            SELECT id, filepath, filename, object, filter, imagetyp,
+                   exposure, ccd_temp, xbinning, ybinning, date_loc
+            FROM xisf_files
+            ORDER BY date_loc, object, imagetyp
+        ''')
 
     def update_file_path(self, file_id: int, new_path: str) -> None:
         """
@@ -381,12 +515,13 @@ class DatabaseManager:
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
-                SELECT DISTINCT strftime("%Y", date_loc) as year
+                SELECT year
                 FROM xisf_files
-                WHERE date_loc IS NOT NULL
+                WHERE year IS NOT NULL
+                GROUP BY year
                 ORDER BY year DESC
             ''')
-            return [row[0] for row in cursor.fetchall()]
+            return [str(row[0]) for row in cursor.fetchall()]
 
     def get_activity_data_for_year(self, year: str) -> Dict[str, float]:
         """
@@ -403,11 +538,11 @@ class DatabaseManager:
             cursor.execute('''
                 SELECT date_loc, SUM(exposure) / 3600.0 as total_hours
                 FROM xisf_files
-                WHERE strftime("%Y", date_loc) = ?
-                    AND imagetyp LIKE '%Light%'
+                WHERE year = ?
+                    AND is_light = 1
                     AND date_loc IS NOT NULL
                 GROUP BY date_loc
-            ''', (year,))
+            ''', (int(year),))
             return {row[0]: row[1] for row in cursor.fetchall()}
 
     def get_analytics_summary(self, year: Optional[str] = None) -> Dict[str, Any]:
@@ -423,31 +558,22 @@ class DatabaseManager:
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
-            where_clause = ''
+            conditions = ['is_light = 1']
             params = []
             if year:
-                where_clause = 'WHERE strftime("%Y", date_loc) = ?'
-                params = [year]
-
-            # Get sessions (distinct dates with light frames)
-            cursor.execute(f'''
-                SELECT COUNT(DISTINCT date_loc)
-                FROM xisf_files
-                {where_clause}
-                    AND imagetyp LIKE '%Light%'
-                    AND date_loc IS NOT NULL
-            ''', params)
-            sessions_count = cursor.fetchone()[0]
+                conditions.append('year = ?')
+                params.append(int(year))
 
-            # Get total exposure hours
+            # Sessions (distinct dates with light frames) and total exposure
+            # hours from a single pass. COUNT(DISTINCT) ignores NULL dates and
+            # SUM ignores NULL exposures, matching the separate queries.
             cursor.execute(f'''
-                SELECT SUM(exposure) / 3600.0
+                SELECT COUNT(DISTINCT date_loc), SUM(exposure) / 3600.0
                 FROM xisf_files
-                {where_clause}
-                    AND imagetyp LIKE '%Light%'
-                    AND exposure IS NOT NULL
+                WHERE {' AND '.join(conditions)}
             ''', params)
-            total_hours = cursor.fetchone()[0] or 0.0
+            sessions_count, total_hours = cursor.fetchone()
+            total_hours = total_hours or 0.0
 
             avg_hours = total_hours / sessions_count if sessions_count > 0 else 0.0
 
@@ -488,8 +614,8 @@ class DatabaseManager:
         if not os.path.exists(self.db_path):
             raise FileNotFoundError(f"Database file not found: {self.db_path}")
 
-        # Create backup using shutil.copy2 to preserve metadata
-        shutil.copy2(self.db_path, backup_path)
+        # Copy without evicting the application's cached database pages
+        _copy_file_uncached(self.db_path, backup_path)
 
         return backup_path
 
@@ -497,8 +623,14 @@ class DatabaseManager:
         """
         Restore database from a backup file.
 
-        Replaces the current database with a backup copy. The current database
-        is first backed up as a safety measure before being replaced.
+        The backup is first copied next to the current database and then
+        swapped in with an atomic rename, so an interrupted restore leaves
+        either the old or the new database intact, never a partial file.
+        Open ProjectManager connections are closed first, so none keeps
+        using (or, on Windows, locking) the replaced file; they reopen on the
+        restored one. The current database's WAL is checkpointed before its
+        sidecar files are removed, so a failed swap loses none of its
+        commits. The restored database is brought up to the current schema.
 
         Args:
             backup_path: Path to the backup file to restore from
@@ -511,24 +643,45 @@ class DatabaseManager:
         if not os.path.exists(backup_path):
             raise FileNotFoundError(f"Backup file not found: {backup_path}")
 
-        # Create a safety backup of current database before restoring
-        if os.path.exists(self.db_path):
-            safety_backup = f"{self.db_path}.pre_restore"
-            shutil.copy2(self.db_path, safety_backup)
+        # Stage the copy in the database directory so os.replace stays on
+        # the same filesystem and is atomic
+        staged_path = f"{self.db_path}.restore.tmp"
 
         try:
-            # Replace current database with backup
-            shutil.copy2(backup_path, self.db_path)
+            _copy_file_uncached(backup_path, staged_path)
+
+            ProjectManager.close_all(self.db_path)
+
+            # Checkpoint the current database's WAL into the main file first,
+            # so removing the sidecars below cannot lose committed data even
+            # if the swap then fails
+            if os.path.exists(self.db_path):
+                conn = sqlite3.connect(self.db_path)
+                try:
+                    busy = conn.execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchone()[0]
+                finally:
+                    conn.close()
+                if busy:
+                    raise OSError("database is in use, could not checkpoint its WAL")
+
+            # Drop the old database's WAL/SHM files so SQLite does not replay
+            # them against the restored database
+            with suppress(FileNotFoundError):
+                os.remove(self.db_path + '-wal')
+            with suppress(FileNotFoundError):
+                os.remove(self.db_path + '-shm')
+
+            os.replace(staged_path, self.db_path)
         except Exception as e:
-            # If restore fails, attempt to restore the safety backup
-            if os.path.exists(f"{self.db_path}.pre_restore"):
-                shutil.copy2(f"{self.db_path}.pre_restore", self.db_path)
+            with suppress(FileNotFoundError):
+                os.remove(staged_path)
             raise OSError(f"Failed to restore backup: {str(e)}")
-        finally:
-            # Clean up safety backup
-            safety_backup_path = f"{self.db_path}.pre_restore"
-            if os.path.exists(safety_backup_path):
-                os.remove(safety_backup_path)
+
+        # A backup from an older version lacks the current columns, indexes
+        # and triggers; upgrade it now rather than on the next restart
+        self._schema_checked = False
+        with self.get_connection():
+            pass
 
     def list_backups(self, backup_dir: str) -> List[Dict[str, Any]]:
         """
@@ -552,18 +705,22 @@ class DatabaseManager:
 
         backups = []
 
-        # Find all .db files in backup directory
-        for filename in os.listdir(backup_dir):
-            if filename.endswith('.db') and 'backup' in filename:
-                filepath = os.path.join(backup_dir, filename)
+        # Find all .db files in backup directory. scandir reuses the
+        # directory listing, so each entry needs at most one stat call.
+        with os.scandir(backup_dir) as entries:
+            for entry in entries:
+                if not (entry.name.endswith('.db') and 'backup' in entry.name):
+                    continue
+                if not entry.is_file():
+                    continue
 
                 # Get file metadata
-                stat = os.stat(filepath)
+                stat = entry.stat()
                 created = datetime.fromtimestamp(stat.st_mtime)
 
                 backups.append({
-                    'filename': filename,
-                    'path': filepath,
+                    'filename': entry.name,
+                    'path': entry.path,
                     'size': stat.st_size,
                     'created': created.strftime("%Y-%m-%d %H:%M:%S"),
                     'created_datetime': created
@@ -4,13 +4,179 @@ Project Manager for AstroFileManager
 Handles database operations for project-based workflow tracking.
 """
 
+import asyncio
+import functools
+import queue
 import sqlite3
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
+from utils.db_schema import (
+    PROJECT_GOAL_METRICS_SQL, RESYNC_GOAL_COUNTS_SQL, RESYNC_GOAL_METRICS_SQL, ensure_schema
+)
+
+# Slotted dataclasses (no per-instance __dict__) need Python 3.10+
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Every live ProjectManager, so ProjectManager.close_all can release their
+# connections before the database file is replaced
+_live_managers: "weakref.WeakSet[ProjectManager]" = weakref.WeakSet()
+
+# SQL for the hottest lookups, kept as module-level constants so every call
+# sends identical text and hits the connection's prepared-statement cache.
+_SQL_GET_PROJECT = '''
+    SELECT id, name, object_name, description, year, start_date,
+           status, created_at, updated_at
+    FROM projects
+    WHERE id = ?
+'''
+
+_SQL_GET_PROJECT_BY_NAME = '''
+    SELECT id, name, object_name, description, year, start_date,
+           status, created_at, updated_at
+    FROM projects
+    WHERE name = ?
+'''
+
+_SQL_LIST_PROJECTS = '''
+    SELECT id, name, object_name, description, year, start_date,
+           status, created_at, updated_at
+    FROM projects
+    WHERE (? IS NULL OR status = ?)
+    ORDER BY created_at DESC
+'''
+
+# Goals with their frame counts and the quality averages of their APPROVED
+# frames. Both are materialized on project_filter_goals and kept current by
+# triggers (see utils.db_schema), so this is a plain indexed read with no
+# aggregation over xisf_files.
+_SQL_GET_FILTER_GOALS = '''
+    SELECT filter, target_count, total_count, approved_count,
+           MAX(0, target_count - total_count),
+           MAX(0, target_count - approved_count),
+           avg_hfd, avg_snr_weight, avg_roundness, avg_sky_flux
+    FROM project_filter_goals
+    WHERE project_id = ?
+    ORDER BY filter
+'''
+
+# Session lookups match the filter with SQLite's NULL-safe ``IS`` operator
+# (the same as the standard IS NOT DISTINCT FROM, but available on every
+# SQLite version). Unlike ``(filter = ? OR (filter IS NULL AND ? IS NULL))``
+# the planner treats it as an equality and seeks the (date_loc, object,
+# filter) indexes on all three columns, with one statement and one parameter.
+_SQL_GET_SESSION_ASSIGNMENT = '''
+    SELECT ps.project_id, ps.id, p.name
+    FROM project_sessions ps
+    JOIN projects p ON ps.project_id = p.id
+    WHERE ps.date_loc = ?
+    AND ps.object_name = ?
+    AND ps.filter IS ?
+'''
+
+_SQL_DELETE_SESSION = '''
+    DELETE FROM project_sessions
+    WHERE date_loc = ?
+    AND object_name = ?
+    AND filter IS ?
+'''
+
+_SQL_UNLINK_SESSION_FRAMES = '''
+    UPDATE xisf_files
+    SET project_id = NULL, session_assignment_id = NULL
+    WHERE date_loc = ?
+    AND object = ?
+    AND is_light = 1
+    AND filter IS ?
+'''
+
+# Session assignment. A NULL filter links all of the session's light frames.
+_SQL_INSERT_SESSION = '''
+    INSERT INTO project_sessions
+    (project_id, session_id, date_loc, object_name, filter, frame_count)
+    VALUES (?, ?, ?, ?, ?, 0)
+'''
+
+_SQL_LINK_SESSION_FRAMES = '''
+    UPDATE xisf_files
+    SET project_id = ?, session_assignment_id = ?
+    WHERE date_loc = ? AND object = ? AND is_light = 1
+    AND (? IS NULL OR filter = ?)
+'''
+
+_SQL_SET_SESSION_FRAME_COUNT = '''
+    UPDATE project_sessions
+    SET frame_count = ?
+    WHERE id = ?
+'''
+
+_SQL_GET_MASTER_FRAMES = '''
+    SELECT
+        pmf.id, pmf.project_id, pmf.file_id, pmf.frame_type,
+        pmf.filter, pmf.exposure, pmf.ccd_temp, pmf.binning,
+        pmf.imported_date, pmf.notes,
+        xf.filename, xf.filepath
+    FROM project_master_frames pmf
+    JOIN xisf_files xf ON pmf.file_id = xf.id
+    WHERE pmf.project_id = ?
+    ORDER BY pmf.frame_type, pmf.filter, pmf.exposure
+    LIMIT ? OFFSET ?
+'''
+
+_SQL_GET_MASTER_FRAMES_SUMMARY = '''
+    SELECT frame_type, COUNT(*) as count
+    FROM project_master_frames
+    WHERE project_id = ?
+    GROUP BY frame_type
+'''
+
+# Variable-length IN (...) lists are padded up to the next of these sizes, so
+# only a handful of distinct statements are ever built and sqlite3's
+# per-connection statement cache actually hits. The last bucket is also the
+# chunk size for longer lists.
+_IN_CLAUSE_BUCKETS = (16, 64, 256, 512)
+
+
+def _in_clause_bucket(n: int) -> int:
+    """Return the smallest IN (...) bucket that holds n values."""
+    for size in _IN_CLAUSE_BUCKETS:
+        if n <= size:
+            return size
+    raise ValueError(f"IN (...) list of {n} values exceeds the largest bucket")
+
+
+@functools.lru_cache(maxsize=len(_IN_CLAUSE_BUCKETS))
+def _import_master_frames_sql(n: int) -> str:
+    """
+    Build the master frame import for an IN list of n file ids.
 
-@dataclass
+    The frame type comes from the indexed frame_kind column (Light, Dark,
+    Flat or Bias, checked in that order); files of any other kind are
+    skipped. Binning is stored as "XxY" when both values are set. The
+    first bound parameter is the project id.
+    """
+    return (
+        'INSERT OR IGNORE INTO project_master_frames '
+        '(project_id, file_id, frame_type, filter, exposure, ccd_temp, binning) '
+        "SELECT ?, id, CASE frame_kind WHEN 'L' THEN 'Master Light' "
+        "WHEN 'D' THEN 'Master Dark' WHEN 'F' THEN 'Master Flat' "
+        "WHEN 'B' THEN 'Master Bias' END, "
+        'filter, exposure, ccd_temp, '
+        "CASE WHEN xbinning AND ybinning THEN xbinning || 'x' || ybinning END "
+        'FROM xisf_files WHERE frame_kind IS NOT NULL '
+        'AND id IN (' + ','.join('?' * n) + ')'
+    )
+
+
+@dataclass(frozen=True, **_SLOTS)
 class Project:
     """Represents an imaging project."""
     id: Optional[int]
@@ -24,7 +190,7 @@ class Project:
     updated_at: Optional[str]
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class FilterGoalProgress:
     """Represents progress toward a filter goal.
 
@@ -48,7 +214,7 @@ class FilterGoalProgress:
     avg_sky_flux: Optional[float] = None
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class MasterFrame:
     """Represents a master frame (calibration or light) linked to a project."""
     id: Optional[int]
@@ -68,6 +234,15 @@ class MasterFrame:
 class ProjectManager:
     """Manages project-related database operations."""
 
+    # Maximum number of pooled read-only connections kept open per manager
+    POOL_SIZE = 4
+    # Prepared statements cached per connection (sqlite3 default is 128)
+    STATEMENT_CACHE_SIZE = 256
+    # Maximum number of cached list_projects/get_filter_goals results
+    READ_CACHE_SIZE = 128
+    # Bound parameters per IN (...) lookup, well below SQLite's variable limit
+    IN_CLAUSE_CHUNK_SIZE = _IN_CLAUSE_BUCKETS[-1]
+
     def __init__(self, db_path: str):
         """
         Initialize ProjectManager.
@@ -76,6 +251,249 @@ class ProjectManager:
             db_path: Path to SQLite database
         """
         self.db_path = db_path
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(self.POOL_SIZE)
+        self._pool_lock = threading.Lock()
+        self._pool_created = 0
+        self._schema_checked = False
+
+        # Single read-write connection; readers come from the pool above
+        self._writer: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.RLock()
+
+        # Read cache for the polled project views. Entries are tagged with a
+        # change token and discarded once the database has changed since.
+        self._read_cache: "OrderedDict[tuple, Tuple[tuple, list]]" = OrderedDict()
+        self._cache_version = 0
+        self._cache_lock = threading.Lock()
+        self._probe_conn: Optional[sqlite3.Connection] = None
+
+        _live_managers.add(self)
+
+    @classmethod
+    def close_all(cls, db_path: str) -> None:
+        """
+        Close the connections of every live manager on a database.
+
+        Used before the database file is swapped out (backup restore). The
+        managers stay usable: they reopen their connections on the new file
+        and bring its schema up to date on first use.
+
+        Args:
+            db_path: Path to SQLite database
+        """
+        target = Path(db_path).absolute()
+        for manager in list(_live_managers):
+            if Path(manager.db_path).absolute() == target:
+                manager.close()
+                manager._schema_checked = False
+
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """
+        Open a new connection with performance PRAGMAs applied.
+
+        Args:
+            read_only: Open the database with mode=ro for the reader pool
+
+        Returns:
+            sqlite3.Connection usable from any thread (one at a time)
+        """
+        if read_only:
+            # Make sure the schema is current (and the WAL files exist)
+            # before any read-only connection is opened
+            self._get_writer()
+            uri = Path(self.db_path).absolute().as_uri() + '?mode=ro'
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False,
+                                   cached_statements=self.STATEMENT_CACHE_SIZE)
+        else:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                   cached_statements=self.STATEMENT_CACHE_SIZE)
+        cursor = conn.cursor()
+        if not read_only:
+            cursor.execute('PRAGMA journal_mode=WAL')  # Write-Ahead Logging
+            cursor.execute('PRAGMA synchronous=NORMAL')  # Faster writes, still safe with WAL
+            cursor.execute('PRAGMA foreign_keys=ON')  # Let ON DELETE CASCADE do its job
+        cursor.execute('PRAGMA temp_store=MEMORY')  # Keep temp b-trees in RAM
+        cursor.execute('PRAGMA cache_size=-64000')  # 64MB cache
+        cursor.execute('PRAGMA mmap_size=268435456')  # 256MB memory-mapped I/O
+        return conn
+
+    def _get_writer(self) -> sqlite3.Connection:
+        """
+        Get the manager's single read-write connection, opening it on first use.
+
+        The first open also brings older databases up to date (indexes etc.).
+
+        Returns:
+            sqlite3.Connection used for all writes
+        """
+        with self._write_lock:
+            if self._writer is None:
+                conn = self._connect()
+                if not self._schema_checked:
+                    ensure_schema(conn.cursor())
+                    conn.commit()
+                    self._schema_checked = True
+                self._writer = conn
+            return self._writer
+
+    @contextmanager
+    def _acquire(self):
+        """
+        Borrow a read-only connection from the reader pool.
+
+        Connections are created lazily up to POOL_SIZE and reused across
+        calls, so SQLite's page cache and parsed schema stay warm. In WAL
+        mode the readers run concurrently with each other and with the
+        writer. Any open transaction is rolled back if the caller raises.
+
+        Yields:
+            sqlite3.Connection: Pooled read-only database connection
+        """
+        conn = None
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                if self._pool_created < self.POOL_SIZE:
+                    self._pool_created += 1
+                    create = True
+                else:
+                    create = False
+            if create:
+                try:
+                    conn = self._connect(read_only=True)
+                except Exception:
+                    with self._pool_lock:
+                        self._pool_created -= 1
+                    raise
+            else:
+                conn = self._pool.get()
+
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._pool.put(conn)
+
+    @contextmanager
+    def _transaction(self):
+        """
+        Use the writer connection inside an explicit write transaction.
+
+        Writes from all threads are serialized on the manager's write lock
+        rather than contending for SQLite's. BEGIN IMMEDIATE takes the
+        database write lock up front so the statements in the block commit
+        together with a single sync instead of one per statement. The
+        transaction is committed when the block exits normally and rolled
+        back if it raises anything, including KeyboardInterrupt or
+        GeneratorExit, so the persistent writer is never left mid-transaction.
+
+        Yields:
+            sqlite3.Connection: Writer connection with an open transaction
+        """
+        conn = self._get_writer()
+        with self._write_lock:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+        self._invalidate_cache()
+
+    def _invalidate_cache(self):
+        """Drop all cached read results. Called after every committed write."""
+        with self._cache_lock:
+            self._cache_version += 1
+            self._read_cache.clear()
+
+    def _change_token(self) -> Tuple[int, int]:
+        """
+        Get a token that changes whenever the database may have changed.
+
+        Writes made through this manager bump the cache version. Writes made
+        by any other connection (another manager, DatabaseManager, import
+        workers) change SQLite's data_version as seen by a dedicated probe
+        connection, which is a cheap header check rather than a query.
+
+        Returns:
+            Tuple of (cache version, data_version)
+        """
+        with self._cache_lock:
+            if self._probe_conn is None:
+                self._probe_conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            data_version = self._probe_conn.execute('PRAGMA data_version').fetchone()[0]
+            return (self._cache_version, data_version)
+
+    def _cached(self, key: tuple, loader: Callable[[], list]) -> list:
+        """
+        Return a cached read result, loading it on a miss.
+
+        Args:
+            key: Cache key identifying the query and its arguments
+            loader: Function that runs the query and returns a list
+
+        Returns:
+            A new list with the (possibly cached) result items. The items
+            themselves are shared between callers, which is why the
+            dataclasses returned here are frozen.
+        """
+        token = self._change_token()
+        with self._cache_lock:
+            entry = self._read_cache.get(key)
+            if entry is not None and entry[0] == token:
+                self._read_cache.move_to_end(key)
+                return list(entry[1])
+
+        # Taken before loading: a write that lands mid-load leaves the entry
+        # with an old token, so the next call reloads it
+        result = loader()
+        with self._cache_lock:
+            self._read_cache[key] = (token, result)
+            self._read_cache.move_to_end(key)
+            if len(self._read_cache) > self.READ_CACHE_SIZE:
+                self._read_cache.popitem(last=False)
+        return list(result)
+
+    def close(self):
+        """
+        Close all connections, running PRAGMA optimize first. Call on shutdown.
+
+        The manager can also be used as a context manager, which closes it
+        on exit. It stays usable after close(); connections are reopened
+        lazily on the next call.
+        """
+        with self._cache_lock:
+            if self._probe_conn is not None:
+                self._probe_conn.close()
+                self._probe_conn = None
+            self._read_cache.clear()
+
+        with self._write_lock:
+            if self._writer is not None:
+                # Refresh planner statistics for tables whose contents have
+                # shifted this session; a no-op when they are still current
+                self._writer.execute('PRAGMA optimize')
+                self._writer.close()
+                self._writer = None
+
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._pool_lock:
+                self._pool_created -= 1
+
+    def __enter__(self) -> "ProjectManager":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def create_project(
         self,
@@ -103,10 +521,9 @@ class ProjectManager:
         Raises:
             sqlite3.IntegrityError: If project name already exists
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._transaction() as conn:
+            cursor = conn.cursor()
 
-        try:
             # Insert project
             cursor.execute('''
                 INSERT INTO projects (name, object_name, description, year, start_date, status)
@@ -115,19 +532,15 @@ class ProjectManager:
 
             project_id = cursor.lastrowid
 
-            # Insert filter goals
-            for filter_name, target_count in filter_goals.items():
-                cursor.execute('''
-                    INSERT INTO project_filter_goals (project_id, filter, target_count)
-                    VALUES (?, ?, ?)
-                ''', (project_id, filter_name, target_count))
+            # Insert filter goals in one batch
+            cursor.executemany('''
+                INSERT INTO project_filter_goals (project_id, filter, target_count)
+                VALUES (?, ?, ?)
+            ''', ((project_id, filter_name, target_count)
+                  for filter_name, target_count in filter_goals.items()))
 
-            conn.commit()
             return project_id
 
-        finally:
-            conn.close()
-
     def get_project(self, project_id: int) -> Optional[Project]:
         """
         Get project by ID.
@@ -138,25 +551,17 @@ class ProjectManager:
         Returns:
             Project object or None if not found
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._acquire() as conn:
+            cursor = conn.cursor()
 
-        try:
-            cursor.execute('''
-                SELECT id, name, object_name, description, year, start_date,
-                       status, created_at, updated_at
-                FROM projects
-                WHERE id = ?
-            ''', (project_id,))
+            cursor.row_factory = sqlite3.Row
+            cursor.execute(_SQL_GET_PROJECT, (project_id,))
 
             row = cursor.fetchone()
             if row:
-                return Project(*row)
+                return Project(**row)
             return None
 
-        finally:
-            conn.close()
-
     def list_projects(self, status: Optional[str] = None) -> List[Project]:
         """
         List all projects.
@@ -167,30 +572,21 @@ class ProjectManager:
         Returns:
             List of Project objects
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        status = status or None
+        return self._cached(('list_projects', status),
+                            lambda: self._load_projects(status))
 
-        try:
-            if status:
-                cursor.execute('''
-                    SELECT id, name, object_name, description, year, start_date,
-                           status, created_at, updated_at
-                    FROM projects
-                    WHERE status = ?
-                    ORDER BY created_at DESC
-                ''', (status,))
-            else:
-                cursor.execute('''
-                    SELECT id, name, object_name, description, year, start_date,
-                           status, created_at, updated_at
-                    FROM projects
-                    ORDER BY created_at DESC
-                ''')
+    def _load_projects(self, status: Optional[str]) -> List[Project]:
+        """Query projects for list_projects, bypassing the read cache."""
+        with self._acquire() as conn:
+            cursor = conn.cursor()
 
-            return [Project(*row) for row in cursor.fetchall()]
+            cursor.row_factory = sqlite3.Row
 
-        finally:
-            conn.close()
+            # One statement for both cases keeps a single cached plan
+            cursor.execute(_SQL_LIST_PROJECTS, (status, status))
+
+            return [Project(**row) for row in cursor]
 
     def get_filter_goals(self, project_id: int) -> List[FilterGoalProgress]:
         """
@@ -202,61 +598,34 @@ class ProjectManager:
         Returns:
             List of FilterGoalProgress objects
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        return self._cached(('filter_goals', project_id),
+                            lambda: self._load_filter_goals(project_id))
 
-        try:
-            cursor.execute('''
-                SELECT filter, target_count, total_count, approved_count
-                FROM project_filter_goals
-                WHERE project_id = ?
-                ORDER BY filter
-            ''', (project_id,))
+    def _load_filter_goals(self, project_id: int) -> List[FilterGoalProgress]:
+        """Query filter goals for get_filter_goals, bypassing the read cache."""
+        with self._acquire() as conn:
+            cursor = conn.cursor()
 
-            goals = []
-            for filter_name, target, total, approved in cursor.fetchall():
-                # Get the native quality metrics for the APPROVED frames of this
-                # filter. These come from AstroFileManager's own metrics engine:
-                #   hfd            - Half Flux Diameter (star size)
-                #   snr_weight     - robust signal-to-noise weight
-                #   star_roundness - median star roundness
-                #   sky_flux_mean  - background/sky flux level
-                # We only average approved frames so the numbers reflect the
-                # data the user actually intends to keep.
-                cursor.execute('''
-                    SELECT AVG(hfd), AVG(snr_weight),
-                           AVG(star_roundness), AVG(sky_flux_mean)
-                    FROM xisf_files
-                    WHERE project_id = ?
-                    AND COALESCE(filter, '') = COALESCE(?, '')
-                    AND imagetyp LIKE '%Light%'
-                    AND approval_status = 'approved'
-                    AND hfd IS NOT NULL
-                ''', (project_id, filter_name))
-
-                avg_result = cursor.fetchone()
-                avg_hfd = avg_result[0] if avg_result and avg_result[0] else None
-                avg_snr_weight = avg_result[1] if avg_result and avg_result[1] else None
-                avg_roundness = avg_result[2] if avg_result and avg_result[2] else None
-                avg_sky_flux = avg_result[3] if avg_result and avg_result[3] else None
-
-                goals.append(FilterGoalProgress(
+            cursor.execute(_SQL_GET_FILTER_GOALS, (project_id,))
+
+            # A zero average is treated as "no data", as the UI expects
+            return [
+                FilterGoalProgress(
                     filter=filter_name,
                     target_count=target,
                     total_count=total,
                     approved_count=approved,
-                    remaining=max(0, target - total),
-                    approved_remaining=max(0, target - approved),
-                    avg_hfd=avg_hfd,
-                    avg_snr_weight=avg_snr_weight,
-                    avg_roundness=avg_roundness,
-                    avg_sky_flux=avg_sky_flux
-                ))
-
-            return goals
-
-        finally:
-            conn.close()
+                    remaining=remaining,
+                    approved_remaining=approved_remaining,
+                    avg_hfd=avg_hfd or None,
+                    avg_snr_weight=avg_snr_weight or None,
+                    avg_roundness=avg_roundness or None,
+                    avg_sky_flux=avg_sky_flux or None
+                )
+                for (filter_name, target, total, approved, remaining,
+                     approved_remaining, avg_hfd, avg_snr_weight,
+                     avg_roundness, avg_sky_flux) in cursor
+            ]
 
     def assign_session_to_project(
         self,
@@ -284,49 +653,144 @@ class ProjectManager:
         Raises:
             sqlite3.IntegrityError: If session already assigned to this project
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._transaction() as conn:
+            cursor = conn.cursor()
 
-        try:
-            # Get frame count for this session
-            cursor.execute('''
-                SELECT COUNT(*)
-                FROM xisf_files
-                WHERE date_loc = ? AND object = ? AND imagetyp LIKE '%Light%'
-                AND (? IS NULL OR filter = ?)
-            ''', (date_loc, object_name, filter_name, filter_name))
+            # Insert session assignment; the frame count is filled in below
+            cursor.execute(_SQL_INSERT_SESSION,
+                           (project_id, session_id, date_loc, object_name, filter_name))
+
+            assignment_id = cursor.lastrowid
+
+            # Link the session's frames to the project. The number of rows
+            # updated is the session's frame count, so no separate COUNT scan
+            # of xisf_files is needed. The goal count triggers on xisf_files
+            # add the frames to the project's filter goals.
+            cursor.execute(_SQL_LINK_SESSION_FRAMES,
+                           (project_id, assignment_id, date_loc, object_name,
+                            filter_name, filter_name))
+
+            frame_count = cursor.rowcount
 
-            frame_count = cursor.fetchone()[0]
+            cursor.execute(_SQL_SET_SESSION_FRAME_COUNT, (frame_count, assignment_id))
+
+            return assignment_id
+
+    @staticmethod
+    def make_session_id(date_loc: str, object_name: str,
+                        filter_name: Optional[str] = None) -> str:
+        """
+        Build the session identifier used for project_sessions rows.
+
+        Args:
+            date_loc: Session date
+            object_name: Object name
+            filter_name: Optional filter name
+
+        Returns:
+            Session identifier (e.g., "2024-11-15_M31_Ha")
+        """
+        filter_suffix = f"_{filter_name}" if filter_name else ""
+        return f"{date_loc}_{object_name}{filter_suffix}"
+
+    def assign_sessions_to_project(
+        self,
+        project_id: int,
+        sessions: List[Tuple[str, str, Optional[str]]]
+    ) -> List[int]:
+        """
+        Assign several sessions to a project in one transaction.
+
+        Equivalent to calling assign_session_to_project for each session, but
+        the inserts, the frame linking and the filter goal recount are each
+        done once for the whole batch instead of once per session.
+
+        Args:
+            project_id: Project ID
+            sessions: List of (date_loc, object_name, filter_name) tuples
+
+        Returns:
+            Session assignment IDs, in the same order as sessions
+
+        Raises:
+            sqlite3.IntegrityError: If a session is already assigned to this project
+        """
+        if not sessions:
+            return []
+
+        with self._transaction() as conn:
+            cursor = conn.cursor()
+
+            # Stage the batch in a connection-local temp table so the
+            # statements below can join against it
+            cursor.execute('''
+                CREATE TEMP TABLE IF NOT EXISTS tmp_assign (
+                    session_id TEXT,
+                    date_loc TEXT,
+                    object_name TEXT,
+                    filter TEXT,
+                    assignment_id INTEGER
+                )
+            ''')
+            cursor.execute('DELETE FROM temp.tmp_assign')
+            cursor.executemany('''
+                INSERT INTO temp.tmp_assign (session_id, date_loc, object_name, filter)
+                VALUES (?, ?, ?, ?)
+            ''', ((self.make_session_id(date_loc, object_name, filter_name),
+                   date_loc, object_name, filter_name)
+                  for date_loc, object_name, filter_name in sessions))
 
-            # Insert session assignment
             cursor.execute('''
                 INSERT INTO project_sessions
                 (project_id, session_id, date_loc, object_name, filter, frame_count)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (project_id, session_id, date_loc, object_name, filter_name, frame_count))
+                SELECT ?, session_id, date_loc, object_name, filter, 0
+                FROM temp.tmp_assign
+                ORDER BY rowid
+            ''', (project_id,))
 
-            assignment_id = cursor.lastrowid
+            cursor.execute('''
+                UPDATE temp.tmp_assign
+                SET assignment_id = (
+                    SELECT ps.id FROM project_sessions ps
+                    WHERE ps.project_id = ? AND ps.session_id = tmp_assign.session_id
+                )
+            ''', (project_id,))
 
-            # Update xisf_files to link frames to project
+            # Link every session's frames in one pass. A NULL filter takes
+            # all of the session's light frames, as in the single-session API.
+            # Filter goal counts follow through the xisf_files triggers.
             cursor.execute('''
                 UPDATE xisf_files
-                SET project_id = ?, session_assignment_id = ?
-                WHERE date_loc = ? AND object = ? AND imagetyp LIKE '%Light%'
-                AND (? IS NULL OR filter = ?)
-            ''', (project_id, assignment_id, date_loc, object_name, filter_name, filter_name))
+                SET project_id = ?, session_assignment_id = t.assignment_id
+                FROM temp.tmp_assign t
+                WHERE xisf_files.date_loc = t.date_loc
+                AND xisf_files.object = t.object_name
+                AND xisf_files.is_light = 1
+                AND (t.filter IS NULL OR xisf_files.filter = t.filter)
+            ''', (project_id,))
 
-            # Update filter goal counts
-            self._update_filter_goal_counts(cursor, project_id)
+            cursor.execute('''
+                UPDATE project_sessions
+                SET frame_count = (
+                    SELECT COUNT(*) FROM xisf_files
+                    WHERE session_assignment_id = project_sessions.id
+                )
+                WHERE id IN (SELECT assignment_id FROM temp.tmp_assign)
+            ''')
 
-            conn.commit()
-            return assignment_id
+            cursor.execute('SELECT assignment_id FROM temp.tmp_assign ORDER BY rowid')
+            assignment_ids = [row[0] for row in cursor.fetchall()]
+            cursor.execute('DELETE FROM temp.tmp_assign')
 
-        finally:
-            conn.close()
+            return assignment_ids
 
     def _update_filter_goal_counts(self, cursor, project_id: int):
         """
-        Update filter goal counts for a project.
+        Recount filter goal counts and metrics for a project from scratch.
+
+        Day-to-day the counts and metrics are kept current by the goal
+        triggers on xisf_files; this full recount backs
+        recalculate_project_counts().
 
         Master Light Frames (imagetyp containing 'Master') are excluded from
         both the total_count and approved_count, as they are tracked separately
@@ -336,31 +800,37 @@ class ProjectManager:
             cursor: SQLite cursor
             project_id: Project ID
         """
-        # Update total_count and approved_count for each filter.
-        # Use COALESCE for NULL-safe filter comparison.
-        # Exclude Master Light Frames (imagetyp LIKE '%Master%') so they do
-        # not inflate the Total or Approved column counts in Filter Goals Progress.
+        # Aggregate the project's frames once per filter, then join the
+        # totals onto the goals in a single UPDATE ... FROM. The LEFT JOIN
+        # resets goals that no longer have frames to zero. Filters are
+        # compared with the NULL-safe IS operator. Master Light Frames
+        # (imagetyp LIKE '%Master%') are excluded so they do not inflate the
+        # Total or Approved column counts in Filter Goals Progress.
         cursor.execute('''
+            WITH agg AS (
+                SELECT filter AS f,
+                       COUNT(*) AS total,
+                       SUM(CASE WHEN approval_status = 'approved' THEN 1 ELSE 0 END) AS approved
+                FROM xisf_files
+                WHERE project_id = ?
+                AND imagetyp NOT LIKE '%Master%'
+                GROUP BY filter
+            )
             UPDATE project_filter_goals
             SET
-                total_count = (
-                    SELECT COUNT(*)
-                    FROM xisf_files
-                    WHERE project_id = ?
-                    AND COALESCE(filter, '') = COALESCE(project_filter_goals.filter, '')
-                    AND imagetyp NOT LIKE '%Master%'
-                ),
-                approved_count = (
-                    SELECT COUNT(*)
-                    FROM xisf_files
-                    WHERE project_id = ?
-                    AND COALESCE(filter, '') = COALESCE(project_filter_goals.filter, '')
-                    AND imagetyp NOT LIKE '%Master%'
-                    AND approval_status = 'approved'
-                ),
+                total_count = COALESCE(counts.total, 0),
+                approved_count = COALESCE(counts.approved, 0),
                 last_updated = CURRENT_TIMESTAMP
-            WHERE project_id = ?
-        ''', (project_id, project_id, project_id))
+            FROM (
+                SELECT g.id AS goal_id, agg.total, agg.approved
+                FROM project_filter_goals g
+                LEFT JOIN agg ON agg.f IS g.filter
+                WHERE g.project_id = ?
+            ) AS counts
+            WHERE project_filter_goals.id = counts.goal_id
+        ''', (project_id, project_id))
+
+        cursor.execute(PROJECT_GOAL_METRICS_SQL, (project_id,))
 
     def recalculate_project_counts(self, project_id: int):
         """
@@ -371,15 +841,23 @@ class ProjectManager:
         Args:
             project_id: Project ID
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._transaction() as conn:
+            cursor = conn.cursor()
 
-        try:
             self._update_filter_goal_counts(cursor, project_id)
-            conn.commit()
 
-        finally:
-            conn.close()
+    def recalculate_all_project_counts(self):
+        """
+        Manually recalculate filter goal counts and metrics for every project.
+
+        The frames are aggregated once for the whole catalog in a single
+        transaction rather than recounting project by project.
+        """
+        with self._transaction() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute(RESYNC_GOAL_COUNTS_SQL)
+            cursor.execute(RESYNC_GOAL_METRICS_SQL)
 
     def update_project_status(self, project_id: int, status: str):
         """
@@ -389,21 +867,15 @@ class ProjectManager:
             project_id: Project ID
             status: New status ('active', 'completed', 'archived')
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._transaction() as conn:
+            cursor = conn.cursor()
 
-        try:
             cursor.execute('''
                 UPDATE projects
                 SET status = ?, updated_at = CURRENT_TIMESTAMP
                 WHERE id = ?
             ''', (status, project_id))
 
-            conn.commit()
-
-        finally:
-            conn.close()
-
     def update_project(self, project_id: int, name: str, object_name: str,
                       year: Optional[int] = None, description: Optional[str] = None):
         """
@@ -416,10 +888,9 @@ class ProjectManager:
             year: Optional year
             description: Optional description
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._transaction() as conn:
+            cursor = conn.cursor()
 
-        try:
             cursor.execute('''
                 UPDATE projects
                 SET name = ?, object_name = ?, year = ?, description = ?,
@@ -427,42 +898,38 @@ class ProjectManager:
                 WHERE id = ?
             ''', (name, object_name, year, description, project_id))
 
-            conn.commit()
-
-        finally:
-            conn.close()
-
     def update_filter_goals(self, project_id: int, filter_goals: Dict[str, int]):
         """
-        Update filter goals for a project. Removes old goals and adds new ones.
+        Update filter goals for a project. Filters not in filter_goals are
+        removed, new filters are added and existing ones get the new target.
 
         Args:
             project_id: Project ID
             filter_goals: Dictionary of {filter_name: target_count}
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        try:
-            # Delete existing filter goals
-            cursor.execute('DELETE FROM project_filter_goals WHERE project_id = ?',
-                         (project_id,))
-
-            # Insert new filter goals
-            for filter_name, target_count in filter_goals.items():
-                cursor.execute('''
-                    INSERT INTO project_filter_goals
-                    (project_id, filter, target_count, total_count, approved_count)
-                    VALUES (?, ?, ?, 0, 0)
-                ''', (project_id, filter_name, target_count))
-
-            # Recalculate counts based on existing frames
-            self._update_filter_goal_counts(cursor, project_id)
-
-            conn.commit()
-
-        finally:
-            conn.close()
+        with self._transaction() as conn:
+            cursor = conn.cursor()
+
+            # Remove goals for filters that are no longer listed
+            filters = list(filter_goals)
+            placeholders = ','.join('?' * len(filters))
+            cursor.execute(f'''
+                DELETE FROM project_filter_goals
+                WHERE project_id = ? AND filter NOT IN ({placeholders})
+            ''', (project_id, *filters))
+
+            # Upsert the remaining goals. Existing rows keep their counts and
+            # are only rewritten when the target actually changes; new goals
+            # get their initial counts from the trg_goal_initial_counts trigger.
+            cursor.executemany('''
+                INSERT INTO project_filter_goals
+                (project_id, filter, target_count, total_count, approved_count)
+                VALUES (?, ?, ?, 0, 0)
+                ON CONFLICT(project_id, filter) DO UPDATE
+                SET target_count = excluded.target_count
+                WHERE target_count != excluded.target_count
+            ''', ((project_id, filter_name, target_count)
+                  for filter_name, target_count in filter_goals.items()))
 
     def get_project_by_name(self, name: str) -> Optional[Project]:
         """
@@ -474,52 +941,36 @@ class ProjectManager:
         Returns:
             Project object or None if not found
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._acquire() as conn:
+            cursor = conn.cursor()
 
-        try:
-            cursor.execute('''
-                SELECT id, name, object_name, description, year, start_date,
-                       status, created_at, updated_at
-                FROM projects
-                WHERE name = ?
-            ''', (name,))
+            cursor.row_factory = sqlite3.Row
+            cursor.execute(_SQL_GET_PROJECT_BY_NAME, (name,))
 
             row = cursor.fetchone()
             if row:
-                return Project(
-                    id=row[0],
-                    name=row[1],
-                    object_name=row[2],
-                    description=row[3],
-                    year=row[4],
-                    start_date=row[5],
-                    status=row[6],
-                    created_at=row[7],
-                    updated_at=row[8]
-                )
+                return Project(**row)
             return None
 
-        finally:
-            conn.close()
-
     def get_unassigned_sessions(self) -> List[Tuple]:
         """
         Get sessions that are not assigned to any project.
 
+        The rows are read in full while the pooled connection is borrowed,
+        so no reader or read snapshot outlives the call.
+
         Returns:
             List of tuples (date_loc, object, filter, frame_count)
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._acquire() as conn:
+            cursor = conn.cursor()
 
-        try:
             cursor.execute('''
                 SELECT
                     date_loc, object, filter,
                     COUNT(*) as frame_count
                 FROM xisf_files
-                WHERE imagetyp LIKE '%Light%'
+                WHERE is_light = 1
                     AND project_id IS NULL
                     AND date_loc IS NOT NULL
                     AND object IS NOT NULL
@@ -529,8 +980,86 @@ class ProjectManager:
 
             return cursor.fetchall()
 
-        finally:
-            conn.close()
+    def count_unassigned_sessions(self) -> int:
+        """
+        Count the sessions that are not assigned to any project.
+
+        Counts the same (date, object, filter) groups that
+        get_unassigned_sessions() lists, without sending the rows to Python.
+
+        Returns:
+            Number of unassigned sessions
+        """
+        with self._acquire() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                SELECT COUNT(*) FROM (
+                    SELECT 1
+                    FROM xisf_files
+                    WHERE is_light = 1
+                        AND project_id IS NULL
+                        AND date_loc IS NOT NULL
+                        AND object IS NOT NULL
+                    GROUP BY date_loc, object, filter
+                )
+            ''')
+
+            return cursor.fetchone()[0]
+
+    def get_object_filters(self, object_name: str) -> List[str]:
+        """
+        Get the filter names used by an object's light frames.
+
+        Args:
+            object_name: Object name
+
+        Returns:
+            Distinct filter names, sorted
+        """
+        with self._acquire() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                SELECT DISTINCT filter
+                FROM xisf_files
+                WHERE object = ?
+                    AND is_light = 1
+                    AND filter IS NOT NULL
+                ORDER BY filter
+            ''', (object_name,))
+
+            return [row[0] for row in cursor.fetchall()]
+
+    def find_object_filter(self, object_name: str, filter_name: str) -> Optional[str]:
+        """
+        Find the catalog spelling of a filter used by an object's light frames.
+
+        Filter names are compared lowercased and trimmed, so "HA" and " Ha"
+        both find "Ha".
+
+        Args:
+            object_name: Object name
+            filter_name: Filter name as typed
+
+        Returns:
+            The filter name as stored in the catalog, or None if no light
+            frame of the object uses that filter
+        """
+        with self._acquire() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                SELECT filter
+                FROM xisf_files
+                WHERE object = ?
+                    AND filter_key = lower(trim(?))
+                    AND is_light = 1
+                LIMIT 1
+            ''', (object_name, filter_name))
+
+            row = cursor.fetchone()
+            return row[0] if row else None
 
     def get_session_assignment(
         self,
@@ -549,25 +1078,15 @@ class ProjectManager:
         Returns:
             Tuple of (project_id, assignment_id, project_name) if assigned, None otherwise
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._acquire() as conn:
+            cursor = conn.cursor()
 
-        try:
-            cursor.execute('''
-                SELECT ps.project_id, ps.id, p.name
-                FROM project_sessions ps
-                JOIN projects p ON ps.project_id = p.id
-                WHERE ps.date_loc = ?
-                AND ps.object_name = ?
-                AND (ps.filter = ? OR (ps.filter IS NULL AND ? IS NULL))
-            ''', (date_loc, object_name, filter_name, filter_name))
+            cursor.execute(_SQL_GET_SESSION_ASSIGNMENT,
+                           (date_loc, object_name, filter_name))
 
             result = cursor.fetchone()
             return result if result else None
 
-        finally:
-            conn.close()
-
     def unassign_session_from_project(
         self,
         date_loc: str,
@@ -582,50 +1101,18 @@ class ProjectManager:
             object_name: Object name
             filter_name: Optional filter name
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._transaction() as conn:
+            cursor = conn.cursor()
 
-        try:
-            # Get the project_id before deleting
-            cursor.execute('''
-                SELECT project_id
-                FROM project_sessions
-                WHERE date_loc = ?
-                AND object_name = ?
-                AND (filter = ? OR (filter IS NULL AND ? IS NULL))
-            ''', (date_loc, object_name, filter_name, filter_name))
+            params = (date_loc, object_name, filter_name)
 
-            result = cursor.fetchone()
-            if not result:
+            cursor.execute(_SQL_DELETE_SESSION, params)
+            if cursor.rowcount == 0:
                 return  # Session not assigned
 
-            project_id = result[0]
-
-            # Delete the session assignment
-            cursor.execute('''
-                DELETE FROM project_sessions
-                WHERE date_loc = ?
-                AND object_name = ?
-                AND (filter = ? OR (filter IS NULL AND ? IS NULL))
-            ''', (date_loc, object_name, filter_name, filter_name))
-
-            # Unlink frames from project
-            cursor.execute('''
-                UPDATE xisf_files
-                SET project_id = NULL, session_assignment_id = NULL
-                WHERE date_loc = ?
-                AND object = ?
-                AND imagetyp LIKE '%Light%'
-                AND (filter = ? OR (filter IS NULL AND ? IS NULL))
-            ''', (date_loc, object_name, filter_name, filter_name))
-
-            # Update filter goal counts for the project
-            self._update_filter_goal_counts(cursor, project_id)
-
-            conn.commit()
-
-        finally:
-            conn.close()
+            # Unlink frames from project. The goal count triggers on
+            # xisf_files take the frames off the project's filter goals.
+            cursor.execute(_SQL_UNLINK_SESSION_FRAMES, params)
 
     def delete_project(self, project_id: int):
         """
@@ -639,27 +1126,16 @@ class ProjectManager:
             - project_filter_goals entries
             - project_sessions entries
             - project_master_frames entries
-            xisf_files project_id will be set to NULL
+            xisf_files project_id will be set to NULL by the
+            trg_projects_unlink_files trigger
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._transaction() as conn:
+            cursor = conn.cursor()
 
-        try:
-            # Unlink frames from project
-            cursor.execute('''
-                UPDATE xisf_files
-                SET project_id = NULL, session_assignment_id = NULL
-                WHERE project_id = ?
-            ''', (project_id,))
-
-            # Delete project (CASCADE will handle related tables)
+            # One statement: CASCADE handles related tables and the trigger
+            # unlinks the project's frames
             cursor.execute('DELETE FROM projects WHERE id = ?', (project_id,))
 
-            conn.commit()
-
-        finally:
-            conn.close()
-
     def import_master_frames(self, project_id: int, file_ids: List[int]) -> int:
         """
         Import master frames (calibration or light frames) to a project.
@@ -677,97 +1153,50 @@ class ProjectManager:
             Master Dark, Master Flat, and Master Bias frames. Duplicate entries
             are ignored due to the UNIQUE constraint.
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        try:
+        with self._transaction() as conn:
+            cursor = conn.cursor()
+
+            # Link the files straight from xisf_files in a few INSERT ...
+            # SELECT statements, chunked to stay well under SQLite's
+            # bound-variable limit. Each chunk is padded with -1 (never a row
+            # id) up to its bucket size so the same few statements are
+            # reused. Frames already imported to this project hit the UNIQUE
+            # constraint and are skipped, so rowcount is the number actually
+            # imported.
             imported_count = 0
-
-            for file_id in file_ids:
-                # Get file metadata
-                cursor.execute('''
-                    SELECT imagetyp, filter, exposure, ccd_temp, xbinning, ybinning
-                    FROM xisf_files
-                    WHERE id = ?
-                ''', (file_id,))
-
-                row = cursor.fetchone()
-                if not row:
-                    continue
-
-                imagetyp, filter_name, exposure, ccd_temp, xbinning, ybinning = row
-
-                # Determine frame type from imagetyp
-                # Support both calibration frames and master light frames
-                frame_type = None
-                if 'Light' in imagetyp:
-                    # Master Light frames (stacked deep-sky object images)
-                    frame_type = 'Master Light'
-                elif 'Dark' in imagetyp:
-                    frame_type = 'Master Dark'
-                elif 'Flat' in imagetyp:
-                    frame_type = 'Master Flat'
-                elif 'Bias' in imagetyp:
-                    frame_type = 'Master Bias'
-                else:
-                    # Skip frames that don't match any known type
-                    continue
-
-                # Create binning string
-                binning = f"{xbinning}x{ybinning}" if xbinning and ybinning else None
-
-                # Insert master frame link (ignore if duplicate)
-                try:
-                    cursor.execute('''
-                        INSERT INTO project_master_frames
-                        (project_id, file_id, frame_type, filter, exposure, ccd_temp, binning)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (project_id, file_id, frame_type, filter_name, exposure, ccd_temp, binning))
-                    imported_count += 1
-                except sqlite3.IntegrityError:
-                    # Frame already imported to this project, skip
-                    pass
-
-            conn.commit()
+            for start in range(0, len(file_ids), self.IN_CLAUSE_CHUNK_SIZE):
+                chunk = list(file_ids[start:start + self.IN_CLAUSE_CHUNK_SIZE])
+                size = _in_clause_bucket(len(chunk))
+                cursor.execute(_import_master_frames_sql(size),
+                               [project_id, *chunk] + [-1] * (size - len(chunk)))
+                imported_count += max(cursor.rowcount, 0)
             return imported_count
 
-        finally:
-            conn.close()
-
-    def get_master_frames(self, project_id: int) -> List[MasterFrame]:
+    def get_master_frames(self, project_id: int, limit: Optional[int] = None,
+                          offset: int = 0) -> List[MasterFrame]:
         """
         Get all master frames for a project.
 
         Args:
             project_id: Project ID
+            limit: Optional maximum number of frames to return (one page)
+            offset: Number of frames to skip before the page starts
 
         Returns:
             List of MasterFrame objects with file details
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._acquire() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
 
-        try:
-            cursor.execute('''
-                SELECT
-                    pmf.id, pmf.project_id, pmf.file_id, pmf.frame_type,
-                    pmf.filter, pmf.exposure, pmf.ccd_temp, pmf.binning,
-                    pmf.imported_date, pmf.notes,
-                    xf.filename, xf.filepath
-                FROM project_master_frames pmf
-                JOIN xisf_files xf ON pmf.file_id = xf.id
-                WHERE pmf.project_id = ?
-                ORDER BY pmf.frame_type, pmf.filter, pmf.exposure
-            ''', (project_id,))
+            # A negative LIMIT means no limit, so one statement covers both.
+            # The page is read in full while the connection is borrowed, so
+            # no reader or read snapshot outlives the call.
+            cursor.execute(_SQL_GET_MASTER_FRAMES,
+                           (project_id, -1 if limit is None else limit, offset))
 
-            master_frames = []
-            for row in cursor.fetchall():
-                master_frames.append(MasterFrame(*row))
-
-            return master_frames
-
-        finally:
-            conn.close()
+            # Columns are matched to MasterFrame fields by name
+            return [MasterFrame(**row) for row in cursor]
 
     def remove_master_frame(self, master_frame_id: int):
         """
@@ -780,20 +1209,14 @@ class ProjectManager:
             This only removes the link to the project, not the actual file
             from the xisf_files table.
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._transaction() as conn:
+            cursor = conn.cursor()
 
-        try:
             cursor.execute('''
                 DELETE FROM project_master_frames
                 WHERE id = ?
             ''', (master_frame_id,))
 
-            conn.commit()
-
-        finally:
-            conn.close()
-
     def get_master_frames_summary(self, project_id: int) -> Dict[str, int]:
         """
         Get summary counts of master frames by type for a project.
@@ -805,22 +1228,138 @@ class ProjectManager:
             Dictionary with frame type as key and count as value
             Example: {'Master Light': 2, 'Master Dark': 3, 'Master Flat': 5, 'Master Bias': 1}
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._acquire() as conn:
+            cursor = conn.cursor()
 
-        try:
-            cursor.execute('''
-                SELECT frame_type, COUNT(*) as count
-                FROM project_master_frames
-                WHERE project_id = ?
-                GROUP BY frame_type
-            ''', (project_id,))
+            cursor.execute(_SQL_GET_MASTER_FRAMES_SUMMARY, (project_id,))
 
-            summary = {}
-            for frame_type, count in cursor.fetchall():
-                summary[frame_type] = count
+            return dict(cursor)
 
-            return summary
 
-        finally:
-            conn.close()
+class AsyncProjectManager:
+    """
+    Awaitable facade over ProjectManager for asyncio callers.
+
+    Each call runs the synchronous method on a small worker thread pool, so
+    SQL work never blocks the event loop. The workers share the wrapped
+    manager's connection pool, which keeps SQLite's page cache and prepared
+    statements warm and means the sync and async APIs go through the same
+    SQL and the same schema upgrade path.
+    """
+
+    def __init__(self, db_path: str, manager: Optional[ProjectManager] = None):
+        """
+        Initialize AsyncProjectManager.
+
+        Args:
+            db_path: Path to SQLite database
+            manager: Existing ProjectManager to share; one is created for
+                     db_path if omitted
+        """
+        self.sync = manager if manager is not None else ProjectManager(db_path)
+        self.db_path = self.sync.db_path
+        # One worker per pooled connection; more would only queue on the pool
+        self._executor = ThreadPoolExecutor(max_workers=ProjectManager.POOL_SIZE,
+                                            thread_name_prefix='project-db')
+
+    async def _run(self, func, *args, **kwargs):
+        """Run a ProjectManager call on the worker pool and await its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor,
+                                          functools.partial(func, *args, **kwargs))
+
+    async def close(self):
+        """Wait for pending calls, then close the shared connection pool."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._executor.shutdown)
+        self.sync.close()
+
+    async def create_project(self, name: str, object_name: str,
+                             filter_goals: Dict[str, int],
+                             description: Optional[str] = None,
+                             year: Optional[int] = None,
+                             start_date: Optional[str] = None) -> int:
+        return await self._run(self.sync.create_project, name, object_name,
+                               filter_goals, description, year, start_date)
+
+    async def get_project(self, project_id: int) -> Optional[Project]:
+        return await self._run(self.sync.get_project, project_id)
+
+    async def get_project_by_name(self, name: str) -> Optional[Project]:
+        return await self._run(self.sync.get_project_by_name, name)
+
+    async def list_projects(self, status: Optional[str] = None) -> List[Project]:
+        return await self._run(self.sync.list_projects, status)
+
+    async def get_filter_goals(self, project_id: int) -> List[FilterGoalProgress]:
+        return await self._run(self.sync.get_filter_goals, project_id)
+
+    async def assign_session_to_project(self, project_id: int, session_id: str,
+                                        date_loc: str, object_name: str,
+                                        filter_name: Optional[str] = None,
+                                        notes: Optional[str] = None) -> int:
+        return await self._run(self.sync.assign_session_to_project, project_id,
+                               session_id, date_loc, object_name, filter_name, notes)
+
+    async def assign_sessions_to_project(self, project_id: int,
+                                         sessions: List[Tuple[str, str, Optional[str]]]
+                                         ) -> List[int]:
+        return await self._run(self.sync.assign_sessions_to_project,
+                               project_id, sessions)
+
+    async def unassign_session_from_project(self, date_loc: str, object_name: str,
+                                            filter_name: Optional[str] = None):
+        return await self._run(self.sync.unassign_session_from_project,
+                               date_loc, object_name, filter_name)
+
+    async def get_session_assignment(self, date_loc: str, object_name: str,
+                                     filter_name: Optional[str] = None
+                                     ) -> Optional[Tuple[int, int, str]]:
+        return await self._run(self.sync.get_session_assignment,
+                               date_loc, object_name, filter_name)
+
+    async def count_unassigned_sessions(self) -> int:
+        return await self._run(self.sync.count_unassigned_sessions)
+
+    async def get_object_filters(self, object_name: str) -> List[str]:
+        return await self._run(self.sync.get_object_filters, object_name)
+
+    async def find_object_filter(self, object_name: str, filter_name: str) -> Optional[str]:
+        return await self._run(self.sync.find_object_filter, object_name, filter_name)
+
+    async def get_unassigned_sessions(self) -> List[Tuple]:
+        return await self._run(self.sync.get_unassigned_sessions)
+
+    async def recalculate_project_counts(self, project_id: int):
+        return await self._run(self.sync.recalculate_project_counts, project_id)
+
+    async def recalculate_all_project_counts(self):
+        return await self._run(self.sync.recalculate_all_project_counts)
+
+    async def update_project_status(self, project_id: int, status: str):
+        return await self._run(self.sync.update_project_status, project_id, status)
+
+    async def update_project(self, project_id: int, name: str, object_name: str,
+                             year: Optional[int] = None,
+                             description: Optional[str] = None):
+        return await self._run(self.sync.update_project, project_id, name,
+                               object_name, year, description)
+
+    async def update_filter_goals(self, project_id: int, filter_goals: Dict[str, int]):
+        return await self._run(self.sync.update_filter_goals, project_id, filter_goals)
+
+    async def delete_project(self, project_id: int):
+        return await self._run(self.sync.delete_project, project_id)
+
+    async def import_master_frames(self, project_id: int, file_ids: List[int]) -> int:
+        return await self._run(self.sync.import_master_frames, project_id, file_ids)
+
+    async def get_master_frames(self, project_id: int, limit: Optional[int] = None,
+                                offset: int = 0) -> List[MasterFrame]:
+        return await self._run(self.sync.get_master_frames, project_id, limit, offset)
+
+    async def remove_master_frame(self, master_frame_id: int):
+        return await self._run(self.sync.remove_master_frame, master_frame_id)
+
+    async def get_master_frames_summary(self, project_id: int) -> Dict[str, int]:
+        return await self._run(self.sync.get_master_frames_summary, project_id)
@@ -4,66 +4,85 @@ Project Templates for AstroFileManager
 Provides pre-configured project templates for common imaging workflows.
 """
 
-from dataclasses import dataclass
-from typing import Dict, List
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
 
+# Slotted dataclasses (no per-instance __dict__) need Python 3.10+
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(frozen=True, **_SLOTS)
 class FilterGoal:
     """Represents a target frame count for a specific filter."""
     filter: str
     target_count: int
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class ProjectTemplate:
     """Represents a project template with predefined filter goals."""
     name: str
     description: str
-    filter_goals: List[FilterGoal]
+    filter_goals: Tuple[FilterGoal, ...]
+    # {filter: target_count}, derived from filter_goals once at construction
+    goals_dict: Dict[str, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Frozen dataclass: assign the derived field through object.__setattr__
+        object.__setattr__(self, 'goals_dict', {
+            goal.filter: goal.target_count for goal in self.filter_goals
+        })
 
 
 # Pre-defined templates
 NARROWBAND_TEMPLATE = ProjectTemplate(
     name="Narrowband (SHO)",
     description="Standard narrowband imaging: 90 frames each of Ha, OIII, SII",
-    filter_goals=[
+    filter_goals=(
         FilterGoal("Ha", 90),
         FilterGoal("OIII", 90),
         FilterGoal("SII", 90),
-    ]
+    )
 )
 
 BROADBAND_TEMPLATE = ProjectTemplate(
     name="Broadband (LRGB)",
     description="Broadband LRGB imaging: 270 Luminance, 270 each RGB",
-    filter_goals=[
+    filter_goals=(
         FilterGoal("Luminance", 270),
         FilterGoal("Red", 270),
         FilterGoal("Green", 270),
         FilterGoal("Blue", 270),
-    ]
+    )
 )
 
 CUSTOM_TEMPLATE = ProjectTemplate(
     name="Custom",
     description="Define your own filter goals",
-    filter_goals=[]
+    filter_goals=()
+)
+
+
+# Templates are immutable, so the list and the name lookup are built once
+_TEMPLATES: Tuple[ProjectTemplate, ...] = (
+    NARROWBAND_TEMPLATE,
+    BROADBAND_TEMPLATE,
+    CUSTOM_TEMPLATE,
 )
+_TEMPLATES_BY_NAME: Dict[str, ProjectTemplate] = {
+    template.name: template for template in _TEMPLATES
+}
 
 
-def get_templates() -> List[ProjectTemplate]:
+def get_templates() -> Tuple[ProjectTemplate, ...]:
     """
-    Get list of available project templates.
+    Get the available project templates.
 
     Returns:
-        List of ProjectTemplate objects
+        Tuple of ProjectTemplate objects
     """
-    return [
-        NARROWBAND_TEMPLATE,
-        BROADBAND_TEMPLATE,
-        CUSTOM_TEMPLATE,
-    ]
+    return _TEMPLATES
 
 
 def get_template_by_name(name: str) -> ProjectTemplate:
@@ -79,10 +98,10 @@ def get_template_by_name(name: str) -> ProjectTemplate:
     Raises:
         ValueError: If template not found
     """
-    for template in get_templates():
-        if template.name == name:
-            return template
-    raise ValueError(f"Template not found: {name}")
+    try:
+        return _TEMPLATES_BY_NAME[name]
+    except KeyError:
+        raise ValueError(f"Template not found: {name}") from None
 
 
 def create_filter_goals_dict(template: ProjectTemplate) -> Dict[str, int]:
@@ -93,6 +112,7 @@ def create_filter_goals_dict(template: ProjectTemplate) -> Dict[str, int]:
         template: ProjectTemplate object
 
     Returns:
-        Dictionary mapping filter names to target counts
+        Dictionary mapping filter names to target counts. The dictionary
+        is shared with the template and must not be modified.
     """
-    return {goal.filter: goal.target_count for goal in template.filter_goals}
+    return template.goals_dict
@@ -4,18 +4,110 @@ Update Manager for AstroFileManager.
 Handles checking for updates from GitHub and downloading/applying them.
 """
 
+import asyncio
+import functools
+import hashlib
 import os
+import re
 import sys
 import shutil
 import tempfile
+import types
 import zipfile
-from typing import Optional, Dict, Any, Callable
-from pathlib import Path
-import urllib.request
-import urllib.error
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Dict, Any, Callable, Iterator, List, Tuple
+from pathlib import Path, PurePosixPath
 import json
+import mmap
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from constants import __VERSION__
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Inflate zip entries with a SIMD deflate decoder (isal or zlib-ng) when
+# one is installed. zipfile looks up zlib.decompressobj at call time, so
+# pointing its module global at a shim is enough; compression stays on
+# the stdlib zlib, and without either package nothing changes.
+try:
+    from isal import isal_zlib as _fast_zlib
+except ImportError:
+    try:
+        from zlib_ng import zlib_ng as _fast_zlib
+    except ImportError:
+        _fast_zlib = None
+
+if _fast_zlib is not None and zipfile.zlib is not None:
+    _zlib_shim = types.SimpleNamespace(**{
+        name: getattr(zlib, name) for name in dir(zlib) if not name.startswith('__')})
+    _zlib_shim.decompressobj = _fast_zlib.decompressobj
+    zipfile.zlib = _zlib_shim
+    zipfile.crc32 = _fast_zlib.crc32
+
+# Parse API responses straight from the body bytes: orjson decodes UTF-8
+# in C when installed, and the stdlib json also accepts bytes, so the
+# body is never materialized as a second str copy (as Response.json() does)
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# Linux FICLONE ioctl: clone a file's extents copy-on-write (Btrfs, XFS
+# with reflink) so a copy shares the data blocks instead of duplicating them
+_FICLONE = 0x40049409
+
+# Paths that an update never overwrites and the backup skips: the user's
+# catalog (*.db, *.db-journal) and bytecode caches (*.pyc, __pycache__).
+# One fused check per path; any '/'-separated component that matches
+# excludes the path, so everything under __pycache__ is skipped too.
+_PRESERVE_RE = re.compile(r'(?:^|/)(?:[^/]*\.db|[^/]*\.db-journal|__pycache__|[^/]*\.pyc)(?:/|$)')
+
+
+def _walk_filtered(root: str, relative_root: str = '') -> Iterator[Tuple[str, str, bool]]:
+    """
+    Walk a directory tree, skipping preserved names.
+
+    Uses os.scandir directly: entry types come from the directory listing
+    itself, so no extra stat is made per file, and each name is checked
+    against the preserve pattern once, before descending. A directory is
+    yielded before its contents; symlinked directories are yielded but not
+    followed (as os.walk does).
+
+    Args:
+        root: Directory to walk
+        relative_root: Path of root relative to the walk's starting point
+
+    Yields:
+        (path, path relative to the starting point, is_dir) tuples
+    """
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if _PRESERVE_RE.search(entry.name):
+                continue
+            relative_path = os.path.join(relative_root, entry.name)
+            if entry.is_dir():
+                yield entry.path, relative_path, True
+                if not entry.is_symlink():
+                    yield from _walk_filtered(entry.path, relative_path)
+            else:
+                yield entry.path, relative_path, False
+
+
+class _ArchiveMap(mmap.mmap):
+    """Read-only memory map usable as a zipfile.ZipFile file object."""
+
+    def seekable(self) -> bool:
+        return True
+
+
+class UpdateIntegrityError(Exception):
+    """Raised when a downloaded update archive is truncated or corrupt."""
+
 
 class UpdateManager:
     """
@@ -27,6 +119,8 @@ class UpdateManager:
 
     GITHUB_REPO = "johnwhobbs/AstroFileManager"
     GITHUB_API_BASE = "https://api.github.com/repos"
+    # Bytes written per chunk while streaming the update archive to disk
+    DOWNLOAD_CHUNK_SIZE = 256 * 1024
 
     def __init__(self, preferred_branch: str = "main"):
         """
@@ -40,41 +134,97 @@ class UpdateManager:
         self.app_dir = Path(__file__).parent.parent.resolve()
         # File to store the current commit SHA
         self.commit_sha_file = self.app_dir / '.update_commit_sha'
-
-    def _get_current_commit_sha(self) -> Optional[str]:
+        # Whether the backup filesystem supports reflink copies (None until
+        # the first backup copy finds out)
+        self._reflink_supported: Optional[bool] = (
+            None if fcntl is not None and sys.platform.startswith('linux') else False
+        )
+
+        # One keep-alive session for all requests, so the API check and the
+        # archive download reuse open TLS connections instead of handshaking
+        # again for every call. Transient failures are retried with backoff.
+        self._session = requests.Session()
+        # GitHub API requires a User-Agent header
+        self._session.headers['User-Agent'] = f'AstroFileManager/{self.current_version}'
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4,
+                              max_retries=Retry(total=3, backoff_factor=0.5))
+        self._session.mount('https://', adapter)
+
+    def close(self):
+        """Release the pooled HTTP connections."""
+        self._session.close()
+
+    def _load_update_state(self) -> Dict[str, Any]:
         """
-        Get the currently installed commit SHA.
+        Load the saved update state.
+
+        The state file holds a small JSON object::
+
+            {"sha": <installed commit SHA>,
+             "etag": <ETag of the last branch API response>,
+             "latest_commit": {"sha": ..., "message": ..., "date": ...}}
+
+        Files written by older versions contain just the installed SHA as
+        plain text and are read as {"sha": <text>}.
 
         Returns:
-            The commit SHA string, or None if not available
+            The state dictionary (empty if not available)
         """
         try:
             if self.commit_sha_file.exists():
-                with open(self.commit_sha_file, 'r') as f:
-                    sha = f.read().strip()
-                    return sha if sha else None
+                text = self.commit_sha_file.read_text().strip()
+                if not text:
+                    return {}
+                try:
+                    state = json.loads(text)
+                except ValueError:
+                    return {'sha': text}
+                return state if isinstance(state, dict) else {}
         except Exception:
             pass
-        return None
+        return {}
 
-    def _save_commit_sha(self, commit_sha: str) -> bool:
+    def _save_update_state(self, **changes: Any) -> bool:
         """
-        Save the commit SHA of the currently installed version.
+        Update fields of the saved update state, keeping the others.
 
         Args:
-            commit_sha: The commit SHA to save
+            **changes: State fields to set (sha, etag, latest_commit)
 
         Returns:
             True if saved successfully, False otherwise
         """
+        state = self._load_update_state()
+        state.update(changes)
         try:
             with open(self.commit_sha_file, 'w') as f:
-                f.write(commit_sha)
+                json.dump(state, f)
             return True
         except Exception as e:
-            print(f"Error saving commit SHA: {e}")
+            print(f"Error saving update state: {e}")
             return False
 
+    def _get_current_commit_sha(self) -> Optional[str]:
+        """
+        Get the currently installed commit SHA.
+
+        Returns:
+            The commit SHA string, or None if not available
+        """
+        return self._load_update_state().get('sha') or None
+
+    def _save_commit_sha(self, commit_sha: str) -> bool:
+        """
+        Save the commit SHA of the currently installed version.
+
+        Args:
+            commit_sha: The commit SHA to save
+
+        Returns:
+            True if saved successfully, False otherwise
+        """
+        return self._save_update_state(sha=commit_sha)
+
     def check_for_updates(self, progress_callback: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
         """
         Check if updates are available on GitHub.
@@ -102,17 +252,31 @@ class UpdateManager:
             # Get the latest commit info from the preferred branch
             url = f"{self.GITHUB_API_BASE}/{self.GITHUB_REPO}/branches/{self.preferred_branch}"
 
-            # Create request with User-Agent header (GitHub API requires it)
-            req = urllib.request.Request(url)
-            req.add_header('User-Agent', f'AstroFileManager/{self.current_version}')
-
-            with urllib.request.urlopen(req, timeout=10) as response:
-                data = json.loads(response.read().decode('utf-8'))
-
-            commit_info = data['commit']
-            commit_sha = commit_info['sha']
-            commit_message = commit_info['commit']['message']
-            commit_date = commit_info['commit']['author']['date']
+            # Conditional request: if the branch has not moved since the last
+            # check, GitHub answers 304 with an empty body, which does not
+            # count against the API rate limit, and the cached commit is used
+            state = self._load_update_state()
+            latest_commit = state.get('latest_commit')
+            headers = {}
+            if state.get('etag') and latest_commit:
+                headers['If-None-Match'] = state['etag']
+
+            response = self._session.get(url, headers=headers, timeout=10)
+            response.raise_for_status()
+
+            if response.status_code != 304:
+                commit_info = _json_loads(response.content)['commit']
+                latest_commit = {
+                    'sha': commit_info['sha'],
+                    'message': commit_info['commit']['message'],
+                    'date': commit_info['commit']['author']['date'],
+                }
+                self._save_update_state(etag=response.headers.get('ETag'),
+                                        latest_commit=latest_commit)
+
+            commit_sha = latest_commit['sha']
+            commit_message = latest_commit['message']
+            commit_date = latest_commit['date']
 
             # Get the currently installed commit SHA
             current_commit_sha = self._get_current_commit_sha()
@@ -145,7 +309,7 @@ class UpdateManager:
 
             return result
 
-        except urllib.error.URLError as e:
+        except requests.RequestException as e:
             error_msg = f"Network error: {str(e)}"
             if progress_callback:
                 progress_callback(f"Error: {error_msg}")
@@ -162,18 +326,46 @@ class UpdateManager:
                 'error': error_msg
             }
 
+    async def check_for_updates_async(
+            self, progress_callback: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """
+        Awaitable check_for_updates() for asyncio callers.
+
+        The blocking request runs on the event loop's default executor, so
+        the loop keeps running during the handshake and download and several
+        checks can be awaited together.
+
+        Args:
+            progress_callback: Optional callback function to report progress
+
+        Returns:
+            The same dictionary as check_for_updates()
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self.check_for_updates, progress_callback))
+
     def download_update(self,
                        progress_callback: Optional[Callable[[str], None]] = None,
-                       percent_callback: Optional[Callable[[int], None]] = None) -> Optional[Path]:
+                       percent_callback: Optional[Callable[[int], None]] = None
+                       ) -> Optional[Tuple[Path, str]]:
         """
         Download the latest version from GitHub.
 
+        The archive is streamed straight to disk and its SHA-256 digest is
+        computed in the same pass, so no second read is needed to hash it.
+
         Args:
             progress_callback: Optional callback for status messages
             percent_callback: Optional callback for download percentage (0-100)
 
         Returns:
-            Path to the downloaded zip file, or None if download failed
+            Tuple of (path to the downloaded zip file, SHA-256 hex digest),
+            or None if download failed
+
+        Raises:
+            UpdateIntegrityError: If the archive is shorter or longer than
+                the advertised Content-Length, or is not a readable zip file
         """
         try:
             # Download the repository as a zip file
@@ -186,19 +378,47 @@ class UpdateManager:
             temp_dir = Path(tempfile.gettempdir())
             zip_path = temp_dir / f"AstroFileManager_update_{self.preferred_branch}.zip"
 
-            # Download with progress reporting
-            def report_progress(block_num, block_size, total_size):
-                if percent_callback and total_size > 0:
-                    downloaded = block_num * block_size
-                    percent = min(int((downloaded / total_size) * 100), 100)
-                    percent_callback(percent)
+            # Stream the archive to disk, hashing it and reporting progress
+            # (only when the percentage changes) as each chunk arrives
+            digest = hashlib.sha256()
+            with self._session.get(zip_url, stream=True, timeout=30) as response:
+                response.raise_for_status()
+                total_size = int(response.headers.get('Content-Length', 0))
+                downloaded = 0
+                last_percent = -1
+                with open(zip_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=self.DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                        digest.update(chunk)
+                        downloaded += len(chunk)
+                        if percent_callback and total_size > 0:
+                            percent = min(int((downloaded / total_size) * 100), 100)
+                            if percent != last_percent:
+                                percent_callback(percent)
+                                last_percent = percent
+
+            # Reject a truncated or corrupt archive here, before the backup
+            # is waited on and anything is decompressed. Content-Length only
+            # counts decoded bytes when no Content-Encoding was applied.
+            if (total_size > 0 and 'Content-Encoding' not in response.headers
+                    and downloaded != total_size):
+                zip_path.unlink(missing_ok=True)
+                raise UpdateIntegrityError(
+                    f"expected {total_size} bytes but received {downloaded}")
+            if not zipfile.is_zipfile(zip_path):
+                zip_path.unlink(missing_ok=True)
+                raise UpdateIntegrityError("downloaded file is not a valid zip archive")
+
+            sha256 = digest.hexdigest()
+            if progress_callback:
+                progress_callback(f"Download complete (SHA-256: {sha256})")
 
-            urllib.request.urlretrieve(zip_url, zip_path, reporthook=report_progress)
+            return zip_path, sha256
 
+        except UpdateIntegrityError as e:
             if progress_callback:
-                progress_callback("Download complete")
-
-            return zip_path
+                progress_callback(f"Error: Downloaded update failed integrity check: {e}")
+            raise
 
         except Exception as e:
             error_msg = f"Error downloading update: {str(e)}"
@@ -206,10 +426,116 @@ class UpdateManager:
                 progress_callback(f"Error: {error_msg}")
             return None
 
+    def _backup_current(self) -> Path:
+        """
+        Back up the current installation next to the application directory.
+
+        The tree is walked once, skipping preserved files (the catalog
+        database and bytecode caches) while enumerating, and the directory
+        structure is created up front. The per-file copies are latency-bound
+        small-file I/O, so they run on a thread pool to keep several in
+        flight at once. An existing backup for the current version is kept
+        as is.
+
+        Returns:
+            Path to the backup directory
+        """
+        backup_dir = self.app_dir.parent / f"AstroFileManager_backup_{self.current_version}"
+        if backup_dir.exists():
+            return backup_dir
+
+        backup_dir.mkdir(parents=True)
+        sources = []
+        destinations = []
+        for src, relative_path, is_dir in _walk_filtered(str(self.app_dir)):
+            if is_dir:
+                (backup_dir / relative_path).mkdir(exist_ok=True)
+            else:
+                sources.append(src)
+                destinations.append(backup_dir / relative_path)
+
+        # Probe reflink support with the first file so the pool below does
+        # not race to find out
+        if sources:
+            self._backup_file(sources.pop(0), destinations.pop(0))
+
+        workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Consume the results so the first copy error is raised here
+            for _ in executor.map(self._backup_file, sources, destinations):
+                pass
+        return backup_dir
+
+    def _backup_file(self, src: str, dst: Path) -> None:
+        """
+        Copy one file into the backup, as a reflink clone when possible.
+
+        On copy-on-write filesystems the clone only copies metadata, so the
+        backup is near-instant and takes no extra space until files diverge.
+        The first failed clone (unsupported filesystem, or source and
+        backup on different filesystems) switches to regular copies for the
+        rest of the session.
+
+        Args:
+            src: Source file path
+            dst: Destination file path
+        """
+        if self._reflink_supported is not False:
+            try:
+                with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                    fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+                shutil.copystat(src, dst)
+                self._reflink_supported = True
+                return
+            except OSError:
+                self._reflink_supported = False
+        shutil.copy2(src, dst)
+
+    def download_and_apply_update(self,
+                                  commit_sha: Optional[str] = None,
+                                  progress_callback: Optional[Callable[[str], None]] = None,
+                                  percent_callback: Optional[Callable[[int], None]] = None) -> bool:
+        """
+        Download and apply the latest version, backing up while downloading.
+
+        The backup only reads the application directory and the download only
+        writes the archive, so the backup runs on a worker thread during the
+        download and the apply step waits for it just before files are
+        overwritten.
+
+        Args:
+            commit_sha: Optional commit SHA to save after successful update
+            progress_callback: Optional callback for status messages
+            percent_callback: Optional callback for download percentage (0-100)
+
+        Returns:
+            True if update was applied successfully, False otherwise
+
+        Raises:
+            UpdateIntegrityError: If the downloaded archive is truncated or
+                corrupt; nothing has been overwritten when this is raised
+        """
+        if progress_callback:
+            progress_callback("Backing up current version in the background...")
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            backup = executor.submit(self._backup_current)
+
+            download = self.download_update(progress_callback=progress_callback,
+                                            percent_callback=percent_callback)
+            if download is None:
+                return False
+            zip_path, _sha256 = download
+
+            return self.apply_update(zip_path, commit_sha=commit_sha,
+                                     progress_callback=progress_callback,
+                                     backup=backup)
+
     def apply_update(self,
                     zip_path: Path,
                     commit_sha: Optional[str] = None,
-                    progress_callback: Optional[Callable[[str], None]] = None) -> bool:
+                    progress_callback: Optional[Callable[[str], None]] = None,
+                    backup: Optional[Future] = None) -> bool:
         """
         Apply the downloaded update by extracting files.
 
@@ -217,6 +543,9 @@ class UpdateManager:
             zip_path: Path to the downloaded zip file
             commit_sha: Optional commit SHA to save after successful update
             progress_callback: Optional callback for status messages
+            backup: Optional future of a backup already running in the
+                    background (see download_and_apply_update); when omitted
+                    the backup is made here
 
         Returns:
             True if update was applied successfully, False otherwise
@@ -225,66 +554,70 @@ class UpdateManager:
             if progress_callback:
                 progress_callback("Preparing to apply update...")
 
-            # Create a backup directory
-            backup_dir = self.app_dir.parent / f"AstroFileManager_backup_{self.current_version}"
-
-            # Extract to a temporary location first
-            temp_extract_dir = Path(tempfile.gettempdir()) / "AstroFileManager_update_extract"
-            if temp_extract_dir.exists():
-                shutil.rmtree(temp_extract_dir)
-            temp_extract_dir.mkdir(parents=True)
-
-            if progress_callback:
-                progress_callback("Extracting update files...")
-
-            # Extract the zip file
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(temp_extract_dir)
-
-            # The extracted folder will be named AstroFileManager-<branch>
-            extracted_folder = temp_extract_dir / f"AstroFileManager-{self.preferred_branch}"
-
-            if not extracted_folder.exists():
-                # Try without the branch suffix
-                extracted_folder = temp_extract_dir / "AstroFileManager"
-                if not extracted_folder.exists():
+            # Read the archive through a read-only memory map: it was just
+            # written, so its pages are in the cache and entries are read
+            # straight from the mapping instead of through read() calls
+            with open(zip_path, 'rb') as zip_file, \
+                    _ArchiveMap(zip_file.fileno(), 0, access=mmap.ACCESS_READ) as zip_map, \
+                    zipfile.ZipFile(zip_map, 'r') as zip_ref:
+                entries = zip_ref.infolist()
+
+                # Files live under a top-level AstroFileManager-<branch> folder
+                root = None
+                for candidate in (f"AstroFileManager-{self.preferred_branch}", "AstroFileManager"):
+                    if any(info.filename.startswith(candidate + '/') for info in entries):
+                        root = PurePosixPath(candidate)
+                        break
+                if root is None:
                     raise Exception("Could not find extracted folder")
 
-            if progress_callback:
-                progress_callback("Creating backup of current version...")
-
-            # Create backup of current installation (optional but recommended)
-            if not backup_dir.exists():
-                shutil.copytree(self.app_dir, backup_dir,
-                              ignore=shutil.ignore_patterns('*.pyc', '__pycache__', '*.db', '*.db-journal'))
-
-            if progress_callback:
-                progress_callback("Applying update files...")
-
-            # Copy new files over existing ones
-            # Preserve certain files/directories that shouldn't be overwritten
-            preserve_patterns = ['*.db', '*.db-journal', '__pycache__', '*.pyc']
+                # Create backup of current installation (optional but recommended)
+                if backup is None:
+                    if progress_callback:
+                        progress_callback("Creating backup of current version...")
+                    self._backup_current()
+                else:
+                    if progress_callback:
+                        progress_callback("Waiting for backup of current version...")
+                    backup.result()
 
-            for item in extracted_folder.rglob('*'):
-                if item.is_file():
-                    relative_path = item.relative_to(extracted_folder)
-                    dest_path = self.app_dir / relative_path
-
-                    # Skip files we want to preserve
-                    skip = False
-                    for pattern in preserve_patterns:
-                        if item.match(pattern):
-                            skip = True
-                            break
+                if progress_callback:
+                    progress_callback("Applying update files...")
+
+                # Work out where each archive entry goes; preserved files are
+                # skipped before anything is written, and nothing is staged
+                # in a temp folder
+                targets = []
+                for info in entries:
+                    # Skip directories and files we want to preserve
+                    if info.is_dir() or _PRESERVE_RE.search(info.filename):
+                        continue
+                    entry_path = PurePosixPath(info.filename)
+                    if root not in entry_path.parents:
+                        continue
+                    relative_path = entry_path.relative_to(root)
 
-                    if skip:
+                    # Skip anything that would land outside the application
+                    # directory
+                    if '..' in relative_path.parts:
                         continue
 
-                    # Create parent directory if it doesn't exist
-                    dest_path.parent.mkdir(parents=True, exist_ok=True)
+                    targets.append((info, self.app_dir.joinpath(*relative_path.parts)))
+
+                # Create each destination directory once, not once per file
+                for parent in {dest_path.parent for _, dest_path in targets}:
+                    parent.mkdir(parents=True, exist_ok=True)
 
-                    # Copy the file
-                    shutil.copy2(item, dest_path)
+                # Inflate entries on several cores at once (zlib releases the
+                # GIL while decompressing). The workers share this ZipFile;
+                # it tracks a position per open entry and only holds its lock
+                # to copy compressed bytes out of the mapping.
+                workers = max(1, min(os.cpu_count() or 1, len(targets)))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    batches = [targets[i::workers] for i in range(workers)]
+                    # Consume the results so the first extraction error is raised here
+                    for _ in executor.map(self._extract_entries, [zip_ref] * workers, batches):
+                        pass
 
             if progress_callback:
                 progress_callback("Update applied successfully")
@@ -295,9 +628,6 @@ class UpdateManager:
                 if progress_callback:
                     progress_callback(f"Saved commit SHA: {commit_sha[:7]}")
 
-            # Clean up
-            shutil.rmtree(temp_extract_dir, ignore_errors=True)
-
             return True
 
         except Exception as e:
@@ -306,6 +636,20 @@ class UpdateManager:
                 progress_callback(f"Error: {error_msg}")
             return False
 
+    def _extract_entries(self, zip_ref: zipfile.ZipFile,
+                         batch: List[Tuple[zipfile.ZipInfo, Path]]) -> None:
+        """
+        Stream a batch of archive entries to their destination paths.
+
+        Args:
+            zip_ref: The open update archive
+            batch: (entry, destination path) pairs; destination directories
+                   must already exist
+        """
+        for info, dest_path in batch:
+            with zip_ref.open(info) as src, open(dest_path, 'wb') as dst:
+                shutil.copyfileobj(src, dst, self.DOWNLOAD_CHUNK_SIZE)
+
     def prepare_restart(self) -> Dict[str, Any]:
         """
         Prepare information needed to restart the application.
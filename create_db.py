@@ -7,191 +7,215 @@ import sqlite3
 import os
 from pathlib import Path
 
-def create_database(db_path='xisf_catalog.db'):
-    """
-    Create SQLite database with schema for XISF files
-    
-    Args:
-        db_path: Path to the database file
-        
-    Returns:
-        sqlite3.Connection object
-    """
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    # Create table with all FITS keywords and metadata
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS xisf_files (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            file_hash TEXT UNIQUE NOT NULL,
-            filepath TEXT NOT NULL,
-            filename TEXT NOT NULL,
-            telescop TEXT,
-            instrume TEXT,
-            object TEXT,
-            filter TEXT,
-            imagetyp TEXT,
-            exposure REAL,
-            ccd_temp REAL,
-            xbinning INTEGER,
-            ybinning INTEGER,
-            date_loc TEXT,
-            project_id INTEGER,
-            session_assignment_id INTEGER,
-            fwhm REAL,
-            eccentricity REAL,
-            snr REAL,
-            star_count INTEGER,
-            background_level REAL,
-            hfd REAL,
-            sky_flux_mean REAL,
-            star_roundness REAL,
-            num_stars INTEGER,
-            snr_weight REAL,
-            approval_status TEXT DEFAULT 'not_graded',
-            grading_date TEXT,
-            grading_notes TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Create indexes for commonly queried fields
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_filename ON xisf_files(filename)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_object ON xisf_files(object)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_filter ON xisf_files(filter)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_imagetyp ON xisf_files(imagetyp)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_file_hash ON xisf_files(file_hash)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_project_id ON xisf_files(project_id)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_session_assignment_id ON xisf_files(session_assignment_id)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_approval_status ON xisf_files(approval_status)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_fwhm ON xisf_files(fwhm)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_instrume ON xisf_files(instrume)')
+from utils.db_schema import ensure_schema
+
+# Catalog schema, run as one script so all tables and indexes are created
+# in a single transaction (one prepare pass and one sync at commit)
+_SCHEMA_SQL = '''
+    -- Create table with all FITS keywords and metadata
+    CREATE TABLE IF NOT EXISTS xisf_files (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        file_hash TEXT UNIQUE NOT NULL,
+        filepath TEXT NOT NULL,
+        filename TEXT NOT NULL,
+        telescop TEXT,
+        instrume TEXT,
+        object TEXT,
+        filter TEXT,
+        imagetyp TEXT,
+        exposure REAL,
+        ccd_temp REAL,
+        xbinning INTEGER,
+        ybinning INTEGER,
+        date_loc TEXT,
+        project_id INTEGER,
+        session_assignment_id INTEGER,
+        fwhm REAL,
+        eccentricity REAL,
+        snr REAL,
+        star_count INTEGER,
+        background_level REAL,
+        hfd REAL,
+        sky_flux_mean REAL,
+        star_roundness REAL,
+        num_stars INTEGER,
+        snr_weight REAL,
+        approval_status TEXT DEFAULT 'not_graded',
+        grading_date TEXT,
+        grading_notes TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
 
-    # Create composite indexes for optimized queries
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_catalog_hierarchy
-        ON xisf_files(object, filter, date_loc, filename)
-        WHERE object IS NOT NULL
-    ''')
+    -- Create indexes for commonly queried fields
+    CREATE INDEX IF NOT EXISTS idx_filename ON xisf_files(filename);
+    CREATE INDEX IF NOT EXISTS idx_object ON xisf_files(object);
+    CREATE INDEX IF NOT EXISTS idx_filter ON xisf_files(filter);
+    CREATE INDEX IF NOT EXISTS idx_imagetyp ON xisf_files(imagetyp);
+    CREATE INDEX IF NOT EXISTS idx_file_hash ON xisf_files(file_hash);
+    CREATE INDEX IF NOT EXISTS idx_session_assignment_id ON xisf_files(session_assignment_id);
+    CREATE INDEX IF NOT EXISTS idx_approval_status ON xisf_files(approval_status);
+    CREATE INDEX IF NOT EXISTS idx_fwhm ON xisf_files(fwhm);
+    CREATE INDEX IF NOT EXISTS idx_instrume ON xisf_files(instrume);
 
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_calibration_darks
-        ON xisf_files(exposure, ccd_temp, xbinning, ybinning, instrume)
-        WHERE imagetyp LIKE '%Dark%'
-    ''')
+    -- Create composite indexes for optimized queries
+    CREATE INDEX IF NOT EXISTS idx_catalog_hierarchy
+    ON xisf_files(object, filter, date_loc, filename)
+    WHERE object IS NOT NULL;
 
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_calibration_flats
-        ON xisf_files(filter, date_loc, ccd_temp, xbinning, ybinning, instrume)
-        WHERE imagetyp LIKE '%Flat%'
-    ''')
+    -- (The calibration frame indexes are partial on the generated
+    -- frame_kind column, so they are created by ensure_schema)
 
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_calibration_bias
-        ON xisf_files(ccd_temp, xbinning, ybinning, instrume)
-        WHERE imagetyp LIKE '%Bias%'
-    ''')
+    -- Create projects table for imaging campaigns
+    CREATE TABLE IF NOT EXISTS projects (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE,
+        object_name TEXT NOT NULL,
+        description TEXT,
+        year INTEGER,
+        start_date TEXT,
+        status TEXT DEFAULT 'active',
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+    );
 
-    # Create projects table for imaging campaigns
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS projects (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL UNIQUE,
-            object_name TEXT NOT NULL,
-            description TEXT,
-            year INTEGER,
-            start_date TEXT,
-            status TEXT DEFAULT 'active',
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
+    -- Create project_filter_goals table for target frame counts per filter
+    CREATE TABLE IF NOT EXISTS project_filter_goals (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        project_id INTEGER NOT NULL,
+        filter TEXT NOT NULL,
+        target_count INTEGER NOT NULL,
+        total_count INTEGER DEFAULT 0,
+        approved_count INTEGER DEFAULT 0,
+        last_updated TEXT,
+        FOREIGN KEY(project_id) REFERENCES projects(id) ON DELETE CASCADE,
+        UNIQUE(project_id, filter)
+    );
 
-    # Create project_filter_goals table for target frame counts per filter
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS project_filter_goals (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            project_id INTEGER NOT NULL,
-            filter TEXT NOT NULL,
-            target_count INTEGER NOT NULL,
-            total_count INTEGER DEFAULT 0,
-            approved_count INTEGER DEFAULT 0,
-            last_updated TEXT,
-            FOREIGN KEY(project_id) REFERENCES projects(id) ON DELETE CASCADE,
-            UNIQUE(project_id, filter)
-        )
-    ''')
+    -- Create project_sessions table to link sessions to projects
+    CREATE TABLE IF NOT EXISTS project_sessions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        project_id INTEGER NOT NULL,
+        session_id TEXT NOT NULL,
+        date_loc TEXT NOT NULL,
+        object_name TEXT,
+        filter TEXT,
+        frame_count INTEGER DEFAULT 0,
+        approved_count INTEGER DEFAULT 0,
+        rejected_count INTEGER DEFAULT 0,
+        graded INTEGER DEFAULT 0,
+        avg_fwhm REAL,
+        notes TEXT,
+        assigned_date TEXT DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY(project_id) REFERENCES projects(id) ON DELETE CASCADE,
+        UNIQUE(project_id, session_id)
+    );
 
-    # Create project_sessions table to link sessions to projects
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS project_sessions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            project_id INTEGER NOT NULL,
-            session_id TEXT NOT NULL,
-            date_loc TEXT NOT NULL,
-            object_name TEXT,
-            filter TEXT,
-            frame_count INTEGER DEFAULT 0,
-            approved_count INTEGER DEFAULT 0,
-            rejected_count INTEGER DEFAULT 0,
-            graded INTEGER DEFAULT 0,
-            avg_fwhm REAL,
-            notes TEXT,
-            assigned_date TEXT DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY(project_id) REFERENCES projects(id) ON DELETE CASCADE,
-            UNIQUE(project_id, session_id)
-        )
-    ''')
+    -- Create project_master_frames table to track master frames for projects
+    CREATE TABLE IF NOT EXISTS project_master_frames (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        project_id INTEGER NOT NULL,
+        file_id INTEGER NOT NULL,
+        frame_type TEXT NOT NULL,
+        filter TEXT,
+        exposure REAL,
+        ccd_temp REAL,
+        binning TEXT,
+        imported_date TEXT DEFAULT CURRENT_TIMESTAMP,
+        notes TEXT,
+        FOREIGN KEY(project_id) REFERENCES projects(id) ON DELETE CASCADE,
+        FOREIGN KEY(file_id) REFERENCES xisf_files(id) ON DELETE CASCADE,
+        UNIQUE(project_id, file_id)
+    );
 
-    # Create project_master_frames table to track master frames for projects
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS project_master_frames (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            project_id INTEGER NOT NULL,
-            file_id INTEGER NOT NULL,
-            frame_type TEXT NOT NULL,
-            filter TEXT,
-            exposure REAL,
-            ccd_temp REAL,
-            binning TEXT,
-            imported_date TEXT DEFAULT CURRENT_TIMESTAMP,
-            notes TEXT,
-            FOREIGN KEY(project_id) REFERENCES projects(id) ON DELETE CASCADE,
-            FOREIGN KEY(file_id) REFERENCES xisf_files(id) ON DELETE CASCADE,
-            UNIQUE(project_id, file_id)
-        )
-    ''')
+    -- Create indexes for project_master_frames
+    CREATE INDEX IF NOT EXISTS idx_project_master_frames_project_id
+    ON project_master_frames(project_id);
 
-    # Create indexes for project_master_frames
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_project_master_frames_project_id
-        ON project_master_frames(project_id)
-    ''')
+    CREATE INDEX IF NOT EXISTS idx_project_master_frames_file_id
+    ON project_master_frames(file_id);
 
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_project_master_frames_file_id
-        ON project_master_frames(file_id)
-    ''')
+    CREATE INDEX IF NOT EXISTS idx_project_master_frames_type_filter
+    ON project_master_frames(project_id, frame_type, filter);
+'''
 
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_project_master_frames_type_filter
-        ON project_master_frames(project_id, frame_type, filter)
-    ''')
+# Starting planner statistics for a new, empty catalog, sized for a typical
+# catalog of ~10,000 frames (mostly lights). Each stat is the number of
+# index entries followed by the average rows per distinct value of each
+# leading column prefix. Without them the planner has no real statistics on
+# a fresh database and guesses between the overlapping frame_kind indexes.
+# A real ANALYZE (or PRAGMA optimize once the catalog has grown) overwrites
+# these rows.
+_SEED_STATS = [
+    ('xisf_files', 'idx_calibration_dark_kind', '1500 150 30 30 30 15'),
+    ('xisf_files', 'idx_calibration_flat_kind', '1000 250 25 10 10 10 5'),
+    ('xisf_files', 'idx_calibration_bias_kind', '500 100 100 100 50'),
+    ('xisf_files', 'idx_xisf_kind_project', '10000 2500 250'),
+    ('xisf_files', 'idx_catalog_hierarchy', '7000 700 140 30 1'),
+]
 
-    # Performance optimizations
+
+def create_database(db_path='xisf_catalog.db', verbose=False):
+    """
+    Create SQLite database with schema for XISF files
+    
+    Args:
+        db_path: Path to the database file
+        verbose: Print a description of the schema
+        
+    Returns:
+        sqlite3.Connection object
+    """
+    # Autocommit mode: the script below manages its own transaction
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    cursor = conn.cursor()
+
+    # Use 32KB pages for scan-heavy catalog queries. The page size can only
+    # be changed before the first table is created (or via VACUUM), so this
+    # must run first; on an existing database it is a harmless no-op.
+    cursor.execute('PRAGMA page_size=32768')
+
+    # Performance optimizations, set before the DDL so the schema is built
+    # with them too
     # Enable WAL mode for better concurrency (allows reads during writes)
     cursor.execute('PRAGMA journal_mode=WAL')
 
+    # WAL only needs to sync at checkpoints, not on every commit
+    cursor.execute('PRAGMA synchronous=NORMAL')
+
     # Increase cache size to 64MB for better performance
     cursor.execute('PRAGMA cache_size=-64000')
 
     # Enable memory-mapped I/O for faster reads (256MB)
     cursor.execute('PRAGMA mmap_size=268435456')
 
+    # Keep temporary sort/DISTINCT b-trees (index builds) in memory
+    # instead of on disk
+    cursor.execute('PRAGMA temp_store=MEMORY')
+
+    # Create all tables and indexes, then the generated columns, query
+    # indexes and consistency triggers (shared with the runtime schema
+    # upgrade, so it runs after all tables exist), in one transaction
+    cursor.executescript('BEGIN IMMEDIATE;\n' + _SCHEMA_SQL)
+    ensure_schema(cursor)
+
+    # Prime the planner statistics of a brand-new catalog (ensure_schema's
+    # ANALYZE has created sqlite_stat1 but found nothing to measure)
+    cursor.execute("SELECT NOT EXISTS (SELECT 1 FROM xisf_files)"
+                   " AND NOT EXISTS (SELECT 1 FROM sqlite_stat1 WHERE tbl = 'xisf_files')")
+    prime_stats = cursor.fetchone()[0]
+    if prime_stats:
+        cursor.executemany('INSERT INTO sqlite_stat1 (tbl, idx, stat) VALUES (?, ?, ?)',
+                           _SEED_STATS)
     conn.commit()
-    
+
+    if prime_stats:
+        # Make the planner load the new statistics
+        cursor.execute('ANALYZE sqlite_master')
+
+    if not verbose:
+        return conn
+
     print(f"Database created successfully: {db_path}")
     print("\nTable schema:")
     print("-" * 60)
@@ -210,6 +234,10 @@ def create_database(db_path='xisf_catalog.db'):
     print("  xbinning (INTEGER) - X binning")
     print("  ybinning (INTEGER) - Y binning")
     print("  date_loc (TEXT) - Local date/time")
+    print("  year (INTEGER, generated) - Year part of date_loc")
+    print("  is_light (INTEGER, generated) - 1 for light frames, 0 otherwise")
+    print("  frame_kind (TEXT, generated) - L/D/F/B frame kind from imagetyp")
+    print("  filter_key (TEXT, generated) - Lowercased, trimmed filter name")
     print("  project_id (INTEGER) - Project assignment")
     print("  session_assignment_id (INTEGER) - Session assignment")
     print("  fwhm (REAL) - Full Width Half Maximum")
@@ -248,7 +276,7 @@ def main():
         db_path = 'xisf_catalog.db'
     
     # Create the database
-    conn = create_database(db_path)
+    conn = create_database(db_path, verbose=True)
     conn.close()
     
     print(f"\nDatabase ready at: {os.path.abspath(db_path)}")
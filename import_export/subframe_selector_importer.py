@@ -11,6 +11,8 @@ from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
+from constants import MAINTENANCE_ROW_THRESHOLD
+
 
 class SubFrameSelectorImporter:
     """Imports quality metrics from PixInsight SubFrame Selector CSV files."""
@@ -226,6 +228,11 @@ class SubFrameSelectorImporter:
         """
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')  # Write-Ahead Logging
+        cursor.execute('PRAGMA synchronous=NORMAL')  # Faster writes, still safe with WAL
+        cursor.execute('PRAGMA cache_size=-64000')  # 64MB cache
+        cursor.execute('PRAGMA mmap_size=268435456')  # 256MB memory-mapped I/O
+        cursor.execute('PRAGMA temp_store=MEMORY')  # Keep temp b-trees in RAM
 
         stats = {
             'total_csv_frames': len(frames_data),
@@ -243,27 +250,13 @@ class SubFrameSelectorImporter:
 
                 # Find matching frame in database
                 if match_by_filename:
-                    cursor.execute(
-                        'SELECT id, project_id FROM xisf_files WHERE filename = ?',
-                        (filename,)
-                    )
+                    match_clause, match_value = 'filename = ?', filename
                 else:
-                    cursor.execute(
-                        'SELECT id, project_id FROM xisf_files WHERE filepath LIKE ?',
-                        (f'%{filename}',)
-                    )
-
-                result = cursor.fetchone()
-
-                if not result:
-                    stats['not_found'] += 1
-                    continue
-
-                file_id, project_id = result
-                stats['matched'] += 1
+                    match_clause, match_value = 'filepath LIKE ?', f'%{filename}'
 
-                # Update quality metrics
-                cursor.execute('''
+                # Update quality metrics of the first matching frame. RETURNING
+                # hands back its project, so no separate lookup is needed.
+                cursor.execute(f'''
                     UPDATE xisf_files
                     SET fwhm = ?,
                         eccentricity = ?,
@@ -272,7 +265,8 @@ class SubFrameSelectorImporter:
                         background_level = ?,
                         approval_status = ?,
                         grading_date = ?
-                    WHERE id = ?
+                    WHERE id = (SELECT id FROM xisf_files WHERE {match_clause} LIMIT 1)
+                    RETURNING project_id
                 ''', (
                     frame['fwhm'],
                     frame['eccentricity'],
@@ -281,9 +275,19 @@ class SubFrameSelectorImporter:
                     frame['background_level'],
                     frame['approval_status'],
                     frame['grading_date'],
-                    file_id
+                    match_value
                 ))
 
+                # fetchall() also finishes the statement before the next one
+                result = cursor.fetchall()
+
+                if not result:
+                    stats['not_found'] += 1
+                    continue
+
+                project_id = result[0][0]
+                stats['matched'] += 1
+
                 # Track approval counts
                 stats[frame['approval_status']] += 1
 
@@ -291,16 +295,30 @@ class SubFrameSelectorImporter:
                 if project_id:
                     stats['updated_projects'].add(project_id)
 
-            # Update project_sessions grading status
-            for project_id in stats['updated_projects']:
-                self._update_project_grading_status(cursor, project_id)
+            # Refresh the session grading status of every updated project
+            # at once, aggregating their frames in one pass instead of once
+            # per project. Filter goal counts need no refresh: the
+            # xisf_files triggers already applied each UPDATE above to them.
+            if stats['updated_projects']:
+                cursor.execute(
+                    'CREATE TEMP TABLE IF NOT EXISTS tmp_graded_projects '
+                    '(project_id INTEGER PRIMARY KEY)'
+                )
+                cursor.executemany(
+                    'INSERT OR IGNORE INTO temp.tmp_graded_projects (project_id) VALUES (?)',
+                    ((project_id,) for project_id in stats['updated_projects'])
+                )
 
-            # Update project filter goal counts
-            for project_id in stats['updated_projects']:
-                self._update_project_filter_goals(cursor, project_id)
+                # Update project_sessions grading status
+                self._update_project_grading_status(cursor)
 
             conn.commit()
 
+            # Grading many frames shifts the approval_status distribution;
+            # refresh the planner statistics for the grouped counts
+            if stats['matched'] >= MAINTENANCE_ROW_THRESHOLD:
+                cursor.execute('PRAGMA optimize')
+
             # Convert set to count for return
             stats['updated_projects'] = len(stats['updated_projects'])
 
@@ -313,82 +331,37 @@ class SubFrameSelectorImporter:
 
         return stats
 
-    def _update_project_grading_status(self, cursor, project_id: int):
+    def _update_project_grading_status(self, cursor):
         """
         Update project_sessions grading status.
 
-        Args:
-            cursor: SQLite cursor
-            project_id: Project ID
-        """
-        # Update graded flag and counts for each session
-        cursor.execute('''
-            UPDATE project_sessions
-            SET
-                graded = CASE
-                    WHEN (
-                        SELECT COUNT(*)
-                        FROM xisf_files
-                        WHERE session_assignment_id = project_sessions.id
-                        AND approval_status = 'not_graded'
-                    ) = 0 THEN 1
-                    ELSE 0
-                END,
-                approved_count = (
-                    SELECT COUNT(*)
-                    FROM xisf_files
-                    WHERE session_assignment_id = project_sessions.id
-                    AND approval_status = 'approved'
-                ),
-                rejected_count = (
-                    SELECT COUNT(*)
-                    FROM xisf_files
-                    WHERE session_assignment_id = project_sessions.id
-                    AND approval_status = 'rejected'
-                ),
-                avg_fwhm = (
-                    SELECT AVG(fwhm)
-                    FROM xisf_files
-                    WHERE session_assignment_id = project_sessions.id
-                    AND fwhm IS NOT NULL
-                )
-            WHERE project_id = ?
-        ''', (project_id,))
-
-    def _update_project_filter_goals(self, cursor, project_id: int):
-        """
-        Update project filter goal counts.
-
-        Master Light Frames (imagetyp containing 'Master') are excluded from
-        both the total_count and approved_count, as they are tracked separately
-        in the Master Light Frames section and should not inflate the counts in
-        the Filter Goals Progress table.
+        Covers every session of the projects listed in
+        temp.tmp_graded_projects.
 
         Args:
             cursor: SQLite cursor
-            project_id: Project ID
         """
-        # Use COALESCE for NULL-safe filter comparison.
-        # Exclude Master Light Frames so they do not inflate the Total or
-        # Approved column counts in the Filter Goals Progress table.
+        # Aggregate each session's frames once, then join the results onto
+        # the sessions. The LEFT JOIN keeps sessions without frames (graded,
+        # zero counts, no average FWHM).
         cursor.execute('''
-            UPDATE project_filter_goals
+            UPDATE project_sessions
             SET
-                total_count = (
-                    SELECT COUNT(*)
-                    FROM xisf_files
-                    WHERE project_id = ?
-                    AND COALESCE(filter, '') = COALESCE(project_filter_goals.filter, '')
-                    AND imagetyp NOT LIKE '%Master%'
-                ),
-                approved_count = (
-                    SELECT COUNT(*)
-                    FROM xisf_files
-                    WHERE project_id = ?
-                    AND COALESCE(filter, '') = COALESCE(project_filter_goals.filter, '')
-                    AND imagetyp NOT LIKE '%Master%'
-                    AND approval_status = 'approved'
-                ),
-                last_updated = CURRENT_TIMESTAMP
-            WHERE project_id = ?
-        ''', (project_id, project_id, project_id))
+                graded = CASE WHEN s.not_graded = 0 THEN 1 ELSE 0 END,
+                approved_count = s.approved,
+                rejected_count = s.rejected,
+                avg_fwhm = s.avg_fwhm
+            FROM (
+                SELECT
+                    ps.id AS session_id,
+                    COUNT(CASE WHEN x.approval_status = 'not_graded' THEN 1 END) AS not_graded,
+                    COUNT(CASE WHEN x.approval_status = 'approved' THEN 1 END) AS approved,
+                    COUNT(CASE WHEN x.approval_status = 'rejected' THEN 1 END) AS rejected,
+                    AVG(x.fwhm) AS avg_fwhm
+                FROM project_sessions ps
+                LEFT JOIN xisf_files x ON x.session_assignment_id = ps.id
+                WHERE ps.project_id IN (SELECT project_id FROM temp.tmp_graded_projects)
+                GROUP BY ps.id
+            ) AS s
+            WHERE project_sessions.id = s.session_id
+        ''')
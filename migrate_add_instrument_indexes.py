@@ -16,6 +16,8 @@ import sqlite3
 import sys
 import os
 
+from utils.db_schema import ensure_query_indexes, ensure_schema
+
 
 def migrate_database(db_path='xisf_catalog.db'):
     """
@@ -50,49 +52,37 @@ def migrate_database(db_path='xisf_catalog.db'):
 
         print("✓ Database has 'instrume' column")
 
-        # Drop old indexes if they exist
-        print("\nDropping old calibration indexes...")
-
-        old_indexes = [
-            'idx_calibration_darks',
-            'idx_calibration_flats',
-            'idx_calibration_bias'
-        ]
-
-        for index_name in old_indexes:
-            try:
-                cursor.execute(f'DROP INDEX IF EXISTS {index_name}')
-                print(f"  ✓ Dropped {index_name}")
-            except sqlite3.Error as e:
-                print(f"  ⚠ Warning dropping {index_name}: {e}")
-
-        # Create new indexes with instrument field
-        print("\nCreating new calibration indexes with instrument field...")
-
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_calibration_darks
-            ON xisf_files(exposure, ccd_temp, xbinning, ybinning, instrume)
-            WHERE imagetyp LIKE '%Dark%'
-        ''')
-        print("  ✓ Created idx_calibration_darks")
-
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_calibration_flats
-            ON xisf_files(filter, date_loc, ccd_temp, xbinning, ybinning, instrume)
-            WHERE imagetyp LIKE '%Flat%'
-        ''')
-        print("  ✓ Created idx_calibration_flats")
-
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_calibration_bias
-            ON xisf_files(ccd_temp, xbinning, ybinning, instrume)
-            WHERE imagetyp LIKE '%Bias%'
-        ''')
-        print("  ✓ Created idx_calibration_bias")
+        # Drop the old imagetyp-LIKE calibration indexes and create the
+        # frame_kind-based ones (together with the rest of the shared query
+        # indexes) from the shared schema definitions. ensure_schema skips
+        # databases already at the current schema version, so the indexes
+        # are also ensured directly in case any were dropped by hand.
+        print("\nReplacing calibration indexes...")
+        ensure_schema(cursor)
+        ensure_query_indexes(cursor)
 
         # Create instrument index if it doesn't exist
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_instrume ON xisf_files(instrume)')
-        print("  ✓ Created idx_instrume")
+
+        # Report the indexes that actually exist now
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        existing_indexes = {row[0] for row in cursor.fetchall()}
+        missing = []
+        for index_name in ('idx_calibration_dark_kind',
+                           'idx_calibration_flat_kind',
+                           'idx_calibration_bias_kind',
+                           'idx_instrume'):
+            if index_name in existing_indexes:
+                print(f"  ✓ {index_name} present")
+            else:
+                print(f"  ✗ {index_name} missing")
+                missing.append(index_name)
+
+        if missing:
+            conn.rollback()
+            conn.close()
+            print(f"\nError: could not create {', '.join(missing)}")
+            return False
 
         # Commit changes
         conn.commit()
@@ -399,11 +399,12 @@ class AnalyticsTab(QWidget):
             cursor = conn.cursor()
 
             # Populate year combo box with available years
+            # (year is the indexed generated column derived from date_loc)
             cursor.execute(
-                'SELECT DISTINCT strftime("%Y", date_loc) AS year '
-                'FROM xisf_files WHERE date_loc IS NOT NULL ORDER BY year DESC'
+                'SELECT year FROM xisf_files WHERE year IS NOT NULL '
+                'GROUP BY year ORDER BY year DESC'
             )
-            years = [row[0] for row in cursor.fetchall()]
+            years = [str(row[0]) for row in cursor.fetchall()]
             current_year = self.year_combo.currentText()
             self.year_combo.blockSignals(True)
             self.year_combo.clear()
@@ -417,6 +418,7 @@ class AnalyticsTab(QWidget):
             if not selected_year:
                 conn.close()
                 return
+            year = int(selected_year)
 
             # ── Activity data ──────────────────────────────────────────────────
             # Total exposure hours per date for the heatmap
@@ -425,31 +427,31 @@ class AnalyticsTab(QWidget):
                     date_loc,
                     SUM(exposure) / 3600.0 AS hours
                 FROM xisf_files
-                WHERE strftime("%Y", date_loc) = ?
+                WHERE year = ?
                     AND date_loc IS NOT NULL
                     AND exposure IS NOT NULL
-                    AND (imagetyp = 'Light Frame' OR imagetyp LIKE '%Light%')
+                    AND is_light = 1
                 GROUP BY date_loc
-            ''', (selected_year,))
+            ''', (year,))
             activity_data = {row[0]: row[1] for row in cursor.fetchall()}
 
             # Number of distinct nights with any imaging
             cursor.execute('''
                 SELECT COUNT(DISTINCT date_loc)
                 FROM xisf_files
-                WHERE strftime("%Y", date_loc) = ?
+                WHERE year = ?
                     AND date_loc IS NOT NULL
-            ''', (selected_year,))
+            ''', (year,))
             total_sessions = cursor.fetchone()[0]
 
             # Total light-frame exposure hours
             cursor.execute('''
                 SELECT SUM(exposure) / 3600.0
                 FROM xisf_files
-                WHERE strftime("%Y", date_loc) = ?
+                WHERE year = ?
                     AND exposure IS NOT NULL
-                    AND (imagetyp = 'Light Frame' OR imagetyp LIKE '%Light%')
-            ''', (selected_year,))
+                    AND is_light = 1
+            ''', (year,))
             total_hours = cursor.fetchone()[0] or 0
             avg_hours = total_hours / total_sessions if total_sessions > 0 else 0
 
@@ -459,12 +461,12 @@ class AnalyticsTab(QWidget):
                     strftime("%m", date_loc) AS month,
                     COUNT(DISTINCT date_loc) AS sessions
                 FROM xisf_files
-                WHERE strftime("%Y", date_loc) = ?
+                WHERE year = ?
                     AND date_loc IS NOT NULL
                 GROUP BY month
                 ORDER BY sessions DESC
                 LIMIT 1
-            ''', (selected_year,))
+            ''', (year,))
             most_active = cursor.fetchone()
             if most_active:
                 month_names = [
@@ -516,10 +518,10 @@ class AnalyticsTab(QWidget):
                     COUNT(CASE WHEN approval_status = 'rejected' THEN 1 END),
                     COUNT(*)
                 FROM xisf_files
-                WHERE (imagetyp = 'Light Frame' OR imagetyp LIKE '%Light%')
-                    AND strftime("%Y", date_loc) = ?
+                WHERE is_light = 1
+                    AND year = ?
                     AND hfd IS NOT NULL
-            ''', (selected_year,))
+            ''', (year,))
             quality_row = cursor.fetchone()
 
             # ── Quality by filter ──────────────────────────────────────────────
@@ -534,12 +536,12 @@ class AnalyticsTab(QWidget):
                     COUNT(CASE WHEN approval_status = 'approved' THEN 1 END),
                     COUNT(*)
                 FROM xisf_files
-                WHERE (imagetyp = 'Light Frame' OR imagetyp LIKE '%Light%')
-                    AND strftime("%Y", date_loc) = ?
+                WHERE is_light = 1
+                    AND year = ?
                     AND hfd IS NOT NULL
                 GROUP BY filter
                 ORDER BY filter
-            ''', (selected_year,))
+            ''', (year,))
             filter_rows = cursor.fetchall()
 
             # ── HFD trend by session ───────────────────────────────────────────
@@ -552,12 +554,12 @@ class AnalyticsTab(QWidget):
                     COUNT(*),
                     COUNT(CASE WHEN approval_status = 'approved' THEN 1 END)
                 FROM xisf_files
-                WHERE (imagetyp = 'Light Frame' OR imagetyp LIKE '%Light%')
-                    AND strftime("%Y", date_loc) = ?
+                WHERE is_light = 1
+                    AND year = ?
                     AND hfd IS NOT NULL
                 GROUP BY date_loc
                 ORDER BY date_loc
-            ''', (selected_year,))
+            ''', (year,))
             hfd_rows = cursor.fetchall()
 
             conn.close()
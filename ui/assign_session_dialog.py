@@ -167,8 +167,9 @@ class AssignSessionDialog(QDialog):
 
         try:
             # Generate session ID
-            filter_suffix = f"_{self.filter_name}" if self.filter_name else ""
-            session_id = f"{self.date_loc}_{self.object_name}{filter_suffix}"
+            session_id = self.project_manager.make_session_id(
+                self.date_loc, self.object_name, self.filter_name
+            )
 
             # Get notes
             notes = self.notes_edit.toPlainText().strip() or None
@@ -210,3 +211,15 @@ class AssignSessionDialog(QDialog):
                     "Error",
                     f"Failed to assign session:\n{error_msg}"
                 )
+
+    def done(self, result: int):
+        """
+        Close the dialog, releasing the project manager's database connections.
+
+        Called for accept, reject and closing the window alike.
+
+        Args:
+            result: Dialog result code
+        """
+        self.project_manager.close()
+        super().done(result)
@@ -80,8 +80,7 @@ class CatalogLoaderWorker(QThread):
                 params.append(self.object_filter)
 
             if self.imagetype_filter == 'Light':
-                where_conditions.append('imagetyp LIKE ?')
-                params.append('%Light%')
+                where_conditions.append('is_light = 1')
             elif self.imagetype_filter == 'Master':
                 where_conditions.append('imagetyp LIKE ?')
                 params.append('%Master%')
@@ -384,7 +383,7 @@ class SessionsLoaderWorker(QThread):
                     SUM(CASE WHEN approval_status = 'rejected' THEN 1 ELSE 0 END) as rejected_count,
                     instrume
                 FROM xisf_files
-                WHERE imagetyp LIKE '%Light%'
+                WHERE is_light = 1
                     AND date_loc IS NOT NULL
                     AND object IS NOT NULL
                 GROUP BY date_loc, object, filter, instrume
@@ -63,8 +63,7 @@ class CatalogLoaderWorker(QThread):
                 params.append(self.object_filter)
 
             if self.imagetype_filter == 'Light':
-                where_conditions.append('imagetyp LIKE ?')
-                params.append('%Light%')
+                where_conditions.append('is_light = 1')
             elif self.imagetype_filter == 'Master':
                 where_conditions.append('imagetyp LIKE ?')
                 params.append('%Master%')
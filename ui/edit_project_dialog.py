@@ -11,10 +11,51 @@ from PyQt6.QtWidgets import (
     QGroupBox, QHeaderView
 )
 from PyQt6.QtCore import Qt
-from typing import Optional, Dict
+from typing import List, Optional, Dict
 
 from core.project_manager import ProjectManager, Project
 
+# Fuzzy filter-name matching uses RapidFuzz's C++ Levenshtein when it is
+# installed and falls back to the standard library's difflib otherwise
+try:
+    from rapidfuzz import process as _fuzz_process
+    from rapidfuzz.distance import Levenshtein as _Levenshtein
+except ImportError:
+    _fuzz_process = None
+    import difflib
+
+# Minimum similarity (0-1) for a catalog filter name to be suggested
+FILTER_MATCH_CUTOFF = 0.6
+
+
+def closest_filter_name(filter_name: str, known_filters: List[str]) -> Optional[str]:
+    """
+    Find the catalog filter name closest to a typed one.
+
+    Names are compared case-insensitively, so "HA" matches "Ha" and
+    "Luminence" matches "Luminance".
+
+    Args:
+        filter_name: Filter name as typed
+        known_filters: Filter names used by the catalog
+
+    Returns:
+        The closest known filter name, or None if none is similar enough
+    """
+    by_folded = {name.casefold(): name for name in known_filters}
+    if _fuzz_process is not None:
+        match = _fuzz_process.extractOne(
+            filter_name.casefold(), list(by_folded),
+            scorer=_Levenshtein.normalized_similarity,
+            score_cutoff=FILTER_MATCH_CUTOFF
+        )
+        return by_folded[match[0]] if match else None
+
+    matches = difflib.get_close_matches(
+        filter_name.casefold(), list(by_folded), n=1, cutoff=FILTER_MATCH_CUTOFF
+    )
+    return by_folded[matches[0]] if matches else None
+
 
 class EditProjectDialog(QDialog):
     """Dialog for editing an existing project."""
@@ -186,6 +227,28 @@ class EditProjectDialog(QDialog):
             QMessageBox.warning(self, "Input Required", "Please enter a filter name.")
             return
 
+        # Goals count frames by exact filter name, so use the catalog's
+        # spelling when the typed name only differs in case or spacing, and
+        # offer it when the typed name is only close to one of them
+        object_name = self.object_input.text().strip()
+        catalog_name = self.project_manager.find_object_filter(object_name, filter_name)
+        if catalog_name is not None:
+            filter_name = catalog_name
+        else:
+            known_filters = self.project_manager.get_object_filters(object_name)
+            suggestion = closest_filter_name(filter_name, known_filters)
+            if suggestion:
+                reply = QMessageBox.question(
+                    self,
+                    "Similar Filter Found",
+                    f"No frames use the filter '{filter_name}', but frames use "
+                    f"'{suggestion}'.\n\nUse '{suggestion}' instead?",
+                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                    QMessageBox.StandardButton.Yes
+                )
+                if reply == QMessageBox.StandardButton.Yes:
+                    filter_name = suggestion
+
         target_count = self.target_input.value()
         self.current_filter_goals[filter_name] = target_count
 
@@ -279,3 +342,15 @@ class EditProjectDialog(QDialog):
                 "Error",
                 f"Failed to update project:\n{str(e)}"
             )
+
+    def done(self, result: int):
+        """
+        Close the dialog, releasing the project manager's database connections.
+
+        Called for accept, reject and closing the window alike.
+
+        Args:
+            result: Dialog result code
+        """
+        self.project_manager.close()
+        super().done(result)
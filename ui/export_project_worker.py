@@ -144,7 +144,7 @@ class ExportProjectWorker(QThread):
                 SELECT DISTINCT filepath
                 FROM xisf_files
                 WHERE project_id = ?
-                AND imagetyp LIKE '%Light%'
+                AND is_light = 1
                 AND approval_status = 'approved'
                 AND filepath IS NOT NULL
                 ORDER BY date_loc, filter, filepath
@@ -241,7 +241,7 @@ class ExportProjectWorker(QThread):
         cursor.execute(f'''
             SELECT DISTINCT filepath
             FROM xisf_files
-            WHERE imagetyp LIKE '%Dark%'
+            WHERE frame_kind = 'D'
                 AND ABS(exposure - ?) < {exp_tolerance}
                 AND ccd_temp BETWEEN ? AND ?
                 AND xbinning = ?
@@ -263,14 +263,14 @@ class ExportProjectWorker(QThread):
         cursor.execute('''
             SELECT DISTINCT filepath
             FROM xisf_files
-            WHERE imagetyp LIKE '%Flat%'
-                AND (filter = ? OR (filter IS NULL AND ? IS NULL))
+            WHERE frame_kind = 'F'
+                AND filter IS ?
                 AND ccd_temp BETWEEN ? AND ?
                 AND xbinning = ?
                 AND ybinning = ?
                 AND date_loc = ?
                 AND filepath IS NOT NULL
-        ''', (filt, filt, temp_min, temp_max, xbin, ybin, date_loc))
+        ''', (filt, temp_min, temp_max, xbin, ybin, date_loc))
 
         flats = {row[0] for row in cursor.fetchall()}
 
@@ -279,15 +279,15 @@ class ExportProjectWorker(QThread):
             cursor.execute('''
                 SELECT DISTINCT filepath
                 FROM xisf_files
-                WHERE imagetyp LIKE '%Flat%'
-                    AND (filter = ? OR (filter IS NULL AND ? IS NULL))
+                WHERE frame_kind = 'F'
+                    AND filter IS ?
                     AND ccd_temp BETWEEN ? AND ?
                     AND xbinning = ?
                     AND ybinning = ?
                     AND filepath IS NOT NULL
                 ORDER BY date_loc DESC
                 LIMIT 50
-            ''', (filt, filt, temp_min, temp_max, xbin, ybin))
+            ''', (filt, temp_min, temp_max, xbin, ybin))
 
             flats = {row[0] for row in cursor.fetchall()}
 
@@ -303,7 +303,7 @@ class ExportProjectWorker(QThread):
         cursor.execute('''
             SELECT DISTINCT filepath
             FROM xisf_files
-            WHERE imagetyp LIKE '%Bias%'
+            WHERE frame_kind = 'B'
                 AND ccd_temp BETWEEN ? AND ?
                 AND xbinning = ?
                 AND ybinning = ?
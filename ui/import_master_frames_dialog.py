@@ -15,6 +15,8 @@ from PyQt6.QtGui import QColor, QBrush
 import sqlite3
 from typing import List, Optional
 
+from core.project_manager import ProjectManager
+
 
 class ImportMasterFramesDialog(QDialog):
     """Dialog for importing master frames to a project."""
@@ -431,9 +433,8 @@ class ImportMasterFramesDialog(QDialog):
 
         # Import master frames using project manager
         try:
-            from core.project_manager import ProjectManager
-            project_manager = ProjectManager(self.db_path)
-            imported_count = project_manager.import_master_frames(self.project_id, file_ids)
+            with ProjectManager(self.db_path) as project_manager:
+                imported_count = project_manager.import_master_frames(self.project_id, file_ids)
 
             QMessageBox.information(
                 self,
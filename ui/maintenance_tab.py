@@ -22,6 +22,11 @@ from PyQt6.QtGui import QColor
 from utils.file_organizer import generate_organized_path
 from core.config_manager import ConfigManager
 from core.database import DatabaseManager
+from utils.db_schema import (
+    RENAME_GOAL_FILTER_SQL,
+    RESYNC_GOAL_COUNTS_SQL,
+    RESYNC_GOAL_METRICS_SQL,
+)
 
 
 class MaintenanceTab(QWidget):
@@ -591,6 +596,15 @@ class MaintenanceTab(QWidget):
                                    (replacement_value, current_value))
                     updated_count = cursor.rowcount
 
+                # Project filter goals follow a renamed filter; their counts
+                # and metrics are then rebuilt under the new name
+                if keyword == 'FILTER':
+                    cursor.execute(RENAME_GOAL_FILTER_SQL,
+                                   (replacement_value, current_value, replacement_value))
+                    if cursor.rowcount:
+                        cursor.execute(RESYNC_GOAL_COUNTS_SQL)
+                        cursor.execute(RESYNC_GOAL_METRICS_SQL)
+
                 conn.commit()
                 conn.close()
 
@@ -1000,11 +1014,12 @@ class MaintenanceTab(QWidget):
                 SELECT DISTINCT
                     i.id, i.filepath, i.filename, i.exposure, i.ccd_temp, i.xbinning, i.ybinning
                 FROM xisf_files i
-                WHERE i.imagetyp LIKE '%Dark%'
+                WHERE i.frame_kind = 'D'
                   AND i.imagetyp NOT LIKE '%Master%'
                   AND EXISTS (
                       SELECT 1 FROM xisf_files m
-                      WHERE m.imagetyp LIKE '%Master%Dark%'
+                      WHERE m.frame_kind = 'D'
+                        AND m.imagetyp LIKE '%Master%'
                         AND ABS(m.exposure - i.exposure) < 0.1
                         AND ABS(COALESCE(m.ccd_temp, 0) - COALESCE(i.ccd_temp, 0)) < 5
                         AND m.xbinning = i.xbinning
@@ -1020,11 +1035,12 @@ class MaintenanceTab(QWidget):
                 SELECT DISTINCT
                     i.id, i.filepath, i.filename, i.filter, i.date_loc, i.ccd_temp, i.xbinning, i.ybinning
                 FROM xisf_files i
-                WHERE i.imagetyp LIKE '%Flat%'
+                WHERE i.frame_kind = 'F'
                   AND i.imagetyp NOT LIKE '%Master%'
                   AND EXISTS (
                       SELECT 1 FROM xisf_files m
-                      WHERE m.imagetyp LIKE '%Master%Flat%'
+                      WHERE m.frame_kind = 'F'
+                        AND m.imagetyp LIKE '%Master%'
                         AND (m.filter = i.filter OR (m.filter IS NULL AND i.filter IS NULL))
                         AND m.date_loc = i.date_loc
                         AND ABS(COALESCE(m.ccd_temp, 0) - COALESCE(i.ccd_temp, 0)) < 5
@@ -1041,11 +1057,12 @@ class MaintenanceTab(QWidget):
                 SELECT DISTINCT
                     i.id, i.filepath, i.filename, i.ccd_temp, i.xbinning, i.ybinning
                 FROM xisf_files i
-                WHERE i.imagetyp LIKE '%Bias%'
+                WHERE i.frame_kind = 'B'
                   AND i.imagetyp NOT LIKE '%Master%'
                   AND EXISTS (
                       SELECT 1 FROM xisf_files m
-                      WHERE m.imagetyp LIKE '%Master%Bias%'
+                      WHERE m.frame_kind = 'B'
+                        AND m.imagetyp LIKE '%Master%'
                         AND ABS(COALESCE(m.ccd_temp, 0) - COALESCE(i.ccd_temp, 0)) < 5
                         AND m.xbinning = i.xbinning
                         AND m.ybinning = i.ybinning
@@ -1200,7 +1217,6 @@ class MaintenanceTab(QWidget):
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
 
-            removed_count = 0
             deleted_files_count = 0
             errors = []
 
@@ -1212,13 +1228,14 @@ class MaintenanceTab(QWidget):
                     filepath = frame[1]
                     all_frames.append((file_id, filepath))
 
-            # Remove from database and optionally delete files
+            # Remove from database in one batch
+            cursor.executemany('DELETE FROM xisf_files WHERE id = ?',
+                               ((file_id,) for file_id, _ in all_frames))
+            removed_count = cursor.rowcount
+
+            # Optionally delete files
             for file_id, filepath in all_frames:
                 try:
-                    # Remove from database
-                    cursor.execute('DELETE FROM xisf_files WHERE id = ?', (file_id,))
-                    removed_count += 1
-
                     # Delete file if requested
                     if delete_files and filepath and os.path.exists(filepath):
                         os.remove(filepath)
@@ -1285,10 +1302,10 @@ class MaintenanceTab(QWidget):
                 SELECT DISTINCT
                     i.id, i.filepath, i.filename, i.exposure, i.ccd_temp, i.xbinning, i.ybinning, i.imagetyp
                 FROM xisf_files i
-                WHERE i.imagetyp LIKE '%Dark%'
+                WHERE i.frame_kind = 'D'
                   AND NOT EXISTS (
                       SELECT 1 FROM xisf_files light
-                      WHERE light.imagetyp LIKE '%Light%'
+                      WHERE light.is_light = 1
                         AND ABS(light.exposure - i.exposure) < 0.1
                         AND ABS(COALESCE(light.ccd_temp, 0) - COALESCE(i.ccd_temp, 0)) <= 1.0
                         AND light.xbinning = i.xbinning
@@ -1296,7 +1313,7 @@ class MaintenanceTab(QWidget):
                   )
                   AND NOT EXISTS (
                       SELECT 1 FROM xisf_files flat
-                      WHERE flat.imagetyp LIKE '%Flat%'
+                      WHERE flat.frame_kind = 'F'
                         AND ABS(flat.exposure - i.exposure) < 0.1
                         AND ABS(COALESCE(flat.ccd_temp, 0) - COALESCE(i.ccd_temp, 0)) <= 1.0
                         AND flat.xbinning = i.xbinning
@@ -1312,10 +1329,10 @@ class MaintenanceTab(QWidget):
                 SELECT DISTINCT
                     i.id, i.filepath, i.filename, i.filter, i.date_loc, i.ccd_temp, i.xbinning, i.ybinning, i.imagetyp
                 FROM xisf_files i
-                WHERE i.imagetyp LIKE '%Flat%'
+                WHERE i.frame_kind = 'F'
                   AND NOT EXISTS (
                       SELECT 1 FROM xisf_files light
-                      WHERE light.imagetyp LIKE '%Light%'
+                      WHERE light.is_light = 1
                         AND (light.filter = i.filter OR (light.filter IS NULL AND i.filter IS NULL))
                         AND light.date_loc = i.date_loc
                         AND ABS(COALESCE(light.ccd_temp, 0) - COALESCE(i.ccd_temp, 0)) <= 3.0
@@ -1332,24 +1349,24 @@ class MaintenanceTab(QWidget):
                 SELECT DISTINCT
                     i.id, i.filepath, i.filename, i.ccd_temp, i.xbinning, i.ybinning, i.imagetyp
                 FROM xisf_files i
-                WHERE i.imagetyp LIKE '%Bias%'
+                WHERE i.frame_kind = 'B'
                   AND NOT EXISTS (
                       SELECT 1 FROM xisf_files light
-                      WHERE light.imagetyp LIKE '%Light%'
+                      WHERE light.is_light = 1
                         AND ABS(COALESCE(light.ccd_temp, 0) - COALESCE(i.ccd_temp, 0)) <= 1.0
                         AND light.xbinning = i.xbinning
                         AND light.ybinning = i.ybinning
                   )
                   AND NOT EXISTS (
                       SELECT 1 FROM xisf_files dark
-                      WHERE dark.imagetyp LIKE '%Dark%'
+                      WHERE dark.frame_kind = 'D'
                         AND ABS(COALESCE(dark.ccd_temp, 0) - COALESCE(i.ccd_temp, 0)) <= 1.0
                         AND dark.xbinning = i.xbinning
                         AND dark.ybinning = i.ybinning
                   )
                   AND NOT EXISTS (
                       SELECT 1 FROM xisf_files flat
-                      WHERE flat.imagetyp LIKE '%Flat%'
+                      WHERE flat.frame_kind = 'F'
                         AND ABS(COALESCE(flat.ccd_temp, 0) - COALESCE(i.ccd_temp, 0)) <= 1.0
                         AND flat.xbinning = i.xbinning
                         AND flat.ybinning = i.ybinning
@@ -1508,7 +1525,6 @@ class MaintenanceTab(QWidget):
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
 
-            removed_count = 0
             deleted_files_count = 0
             errors = []
 
@@ -1520,13 +1536,14 @@ class MaintenanceTab(QWidget):
                     filepath = frame[1]
                     all_frames.append((file_id, filepath))
 
-            # Remove from database and optionally delete files
+            # Remove from database in one batch
+            cursor.executemany('DELETE FROM xisf_files WHERE id = ?',
+                               ((file_id,) for file_id, _ in all_frames))
+            removed_count = cursor.rowcount
+
+            # Optionally delete files
             for file_id, filepath in all_frames:
                 try:
-                    # Remove from database
-                    cursor.execute('DELETE FROM xisf_files WHERE id = ?', (file_id,))
-                    removed_count += 1
-
                     # Delete file if requested
                     if delete_files and filepath and os.path.exists(filepath):
                         os.remove(filepath)
@@ -1670,7 +1687,8 @@ class MaintenanceTab(QWidget):
         Restore the database from the selected backup.
 
         Replaces the current database with the selected backup file.
-        A safety backup is created before restoration.
+        The replacement is atomic, so a failed restore leaves the current
+        database untouched.
         """
         selected_items = self.backup_list.selectedItems()
 
@@ -1690,8 +1708,7 @@ class MaintenanceTab(QWidget):
             self, 'Confirm Restore',
             f'Are you sure you want to restore from this backup?\n\n'
             f'Backup: {backup_filename}\n\n'
-            f'WARNING: This will replace your current database!\n'
-            f'A safety backup of the current database will be created first.\n\n'
+            f'WARNING: This will replace your current database!\n\n'
             f'This action cannot be undone!',
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
             QMessageBox.StandardButton.No
@@ -296,3 +296,15 @@ class NewProjectDialog(QDialog):
                     "Error",
                     f"Failed to create project:\n{error_msg}"
                 )
+
+    def done(self, result: int):
+        """
+        Close the dialog, releasing the project manager's database connections.
+
+        Called for accept, reject and closing the window alike.
+
+        Args:
+            result: Dialog result code
+        """
+        self.project_manager.close()
+        super().done(result)
@@ -363,10 +363,10 @@ class ProjectsTab(QWidget):
             self.projects_table.sortItems(sort_column, sort_order)
 
         # Update unassigned sessions warning
-        unassigned = self.project_manager.get_unassigned_sessions()
-        if unassigned:
+        unassigned_count = self.project_manager.count_unassigned_sessions()
+        if unassigned_count:
             self.unassigned_label.setText(
-                f"⚠️ {len(unassigned)} unassigned sessions"
+                f"⚠️ {unassigned_count} unassigned sessions"
             )
         else:
             self.unassigned_label.setText("")
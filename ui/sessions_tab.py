@@ -478,7 +478,7 @@ class SessionsTab(QWidget):
                     ybinning,
                     instrume
                 FROM xisf_files
-                WHERE imagetyp LIKE '%Light%'
+                WHERE is_light = 1
                     AND date_loc IS NOT NULL
                     AND object IS NOT NULL
                 GROUP BY date_loc, object, filter, instrume
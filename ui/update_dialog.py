@@ -9,7 +9,7 @@ from PyQt6.QtWidgets import (
     QTextEdit, QProgressBar, QGroupBox, QRadioButton, QMessageBox
 )
 from PyQt6.QtCore import Qt, QThread, pyqtSignal
-from core.update_manager import UpdateManager
+from core.update_manager import UpdateIntegrityError, UpdateManager
 from core.config_manager import ConfigManager
 
 
@@ -37,7 +37,10 @@ class UpdateCheckWorker(QThread):
     def run(self):
         """Execute the update check in background thread."""
         update_manager = UpdateManager(preferred_branch=self.branch)
-        result = update_manager.check_for_updates(progress_callback=self.progress.emit)
+        try:
+            result = update_manager.check_for_updates(progress_callback=self.progress.emit)
+        finally:
+            update_manager.close()
         self.finished.emit(result)
 
 
@@ -69,22 +72,19 @@ class UpdateDownloadWorker(QThread):
         """Execute the download and update in background thread."""
         update_manager = UpdateManager(preferred_branch=self.branch)
 
-        # Download the update
-        zip_path = update_manager.download_update(
-            progress_callback=self.progress.emit,
-            percent_callback=self.percent.emit
-        )
-
-        if zip_path is None:
-            self.finished.emit(False)
-            return
-
-        # Apply the update and save the commit SHA
-        success = update_manager.apply_update(
-            zip_path,
-            commit_sha=self.commit_sha,
-            progress_callback=self.progress.emit
-        )
+        # Download and apply the update (the backup runs during the
+        # download) and save the commit SHA
+        try:
+            success = update_manager.download_and_apply_update(
+                commit_sha=self.commit_sha,
+                progress_callback=self.progress.emit,
+                percent_callback=self.percent.emit
+            )
+        except UpdateIntegrityError:
+            # Already reported through progress; the current install is untouched
+            success = False
+        finally:
+            update_manager.close()
 
         self.finished.emit(success)
 
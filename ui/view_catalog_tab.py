@@ -1370,7 +1370,7 @@ Imported: {result[11] or 'N/A'}
         cursor.execute('''
             SELECT SUM(exposure) / 3600.0
             FROM xisf_files
-            WHERE (imagetyp = 'Light Frame' OR imagetyp LIKE '%Light%')
+            WHERE is_light = 1
                 AND exposure IS NOT NULL
         ''')
         total_exposure = cursor.fetchone()[0] or 0
@@ -1384,7 +1384,7 @@ Imported: {result[11] or 'N/A'}
         # Frame breakdown
         cursor.execute('''
             SELECT
-                SUM(CASE WHEN imagetyp LIKE '%Light%' THEN 1 ELSE 0 END) as lights,
+                SUM(is_light) as lights,
                 SUM(CASE WHEN imagetyp LIKE '%Dark%' THEN 1 ELSE 0 END) as darks,
                 SUM(CASE WHEN imagetyp LIKE '%Flat%' THEN 1 ELSE 0 END) as flats,
                 SUM(CASE WHEN imagetyp LIKE '%Bias%' THEN 1 ELSE 0 END) as bias
@@ -2299,17 +2299,9 @@ Imported: {result[11] or 'N/A'}
             # Get filenames from items
             filenames = [item.text(0) for item in items]
 
-            # Get project_ids for affected frames before update
+            # Build bulk update query. Project filter goal counts follow
+            # through the xisf_files triggers in the same statement.
             placeholders = ','.join(['?'] * len(filenames))
-            cursor.execute(f'''
-                SELECT DISTINCT project_id
-                FROM xisf_files
-                WHERE filename IN ({placeholders})
-                AND project_id IS NOT NULL
-            ''', filenames)
-            project_ids = [row[0] for row in cursor.fetchall()]
-
-            # Build bulk update query
             cursor.execute(f'''
                 UPDATE xisf_files
                 SET approval_status = ?, grading_date = ?
@@ -2319,10 +2311,6 @@ Imported: {result[11] or 'N/A'}
             conn.commit()
             conn.close()
 
-            # Recalculate project counts for all affected projects
-            for project_id in project_ids:
-                self.project_manager.recalculate_project_counts(project_id)
-
             # Update visual display for all items
             if status == 'approved':
                 color = QColor(200, 255, 200)  # Light green
@@ -2370,12 +2358,8 @@ Imported: {result[11] or 'N/A'}
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
 
-            # Get project_id before update (if frame is assigned to a project)
-            cursor.execute('SELECT project_id FROM xisf_files WHERE filename = ?', (filename,))
-            result = cursor.fetchone()
-            project_id = result[0] if result and result[0] else None
-
-            # Update approval status
+            # Update approval status (project filter goal counts follow
+            # through the xisf_files triggers)
             grading_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S') if status != 'not_graded' else None
 
             cursor.execute('''
@@ -2387,10 +2371,6 @@ Imported: {result[11] or 'N/A'}
             conn.commit()
             conn.close()
 
-            # Recalculate project counts if frame is part of a project
-            if project_id:
-                self.project_manager.recalculate_project_counts(project_id)
-
             # Update the item display with a refreshed, centered status pill.
             self.catalog_tree.setItemWidget(
                 item, self.status_column, self._create_status_pill(status)
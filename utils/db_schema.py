@@ -0,0 +1,554 @@
+"""
+Shared schema helpers for the AstroFileManager catalog database.
+
+The catalog schema is created by ``create_db.py`` but older databases are
+upgraded in place. Keeping the query-support indexes in one place lets the
+database creation script, the migration scripts and the runtime managers
+apply exactly the same definitions.
+
+All helpers here are idempotent and safe to call on every application start.
+"""
+
+from typing import Dict, List, Tuple
+
+# Version of the definitions below, recorded in the database's
+# ``PRAGMA user_version`` once they have all been applied. Bump it whenever
+# a column, index or trigger is added or changed so existing databases are
+# upgraded on their next start; databases already at this version skip the
+# catalog inspection entirely.
+SCHEMA_VERSION = 5
+
+# Generated columns derived from existing data so hot filters can use plain
+# indexed comparisons instead of evaluating an expression on every row.
+# SQLite only allows VIRTUAL generated columns to be added with ALTER TABLE;
+# they can still be indexed, so the index stores the computed value.
+DERIVED_COLUMNS: Dict[str, str] = {
+    'year': "INTEGER GENERATED ALWAYS AS (CAST(substr(date_loc, 1, 4) AS INTEGER)) VIRTUAL",
+    'is_light': "INTEGER GENERATED ALWAYS AS "
+                "(CASE WHEN imagetyp LIKE '%Light%' THEN 1 ELSE 0 END) VIRTUAL",
+    # Normalized frame kind: 'L'ight, 'D'ark, 'F'lat, 'B'ias or NULL
+    'frame_kind': "TEXT GENERATED ALWAYS AS "
+                  "(CASE WHEN imagetyp LIKE '%Light%' THEN 'L' "
+                  "WHEN imagetyp LIKE '%Dark%' THEN 'D' "
+                  "WHEN imagetyp LIKE '%Flat%' THEN 'F' "
+                  "WHEN imagetyp LIKE '%Bias%' THEN 'B' END) VIRTUAL",
+    # Filter name folded for matching typed names ("ha " -> "ha")
+    'filter_key': "TEXT GENERATED ALWAYS AS (lower(trim(filter))) VIRTUAL",
+}
+
+# Per-goal quality averages materialized on project_filter_goals so the
+# filter goal view reads them directly instead of aggregating xisf_files.
+# The averages are named after the FilterGoalProgress fields they back; the
+# running sums and counts behind them let the goal metric triggers below
+# apply each frame change as a delta instead of re-averaging the goal.
+GOAL_METRIC_COLUMNS: Dict[str, str] = {
+    'avg_hfd': 'REAL',
+    'avg_snr_weight': 'REAL',
+    'avg_roundness': 'REAL',
+    'avg_sky_flux': 'REAL',
+    'hfd_sum': 'REAL DEFAULT 0',
+    'hfd_count': 'INTEGER DEFAULT 0',
+    'snr_weight_sum': 'REAL DEFAULT 0',
+    'snr_weight_count': 'INTEGER DEFAULT 0',
+    'roundness_sum': 'REAL DEFAULT 0',
+    'roundness_count': 'INTEGER DEFAULT 0',
+    'sky_flux_sum': 'REAL DEFAULT 0',
+    'sky_flux_count': 'INTEGER DEFAULT 0',
+}
+
+# Indexes that let the planner answer the catalog's DISTINCT/GROUP BY lookups
+# (object list, keyword values, analytics years) by walking an index instead
+# of scanning the table and sorting the result.
+QUERY_INDEXES: List[Tuple[str, str, str]] = [
+    ('idx_telescop', 'xisf_files',
+     'CREATE INDEX IF NOT EXISTS idx_telescop ON xisf_files(telescop)'),
+    ('idx_year', 'xisf_files',
+     'CREATE INDEX IF NOT EXISTS idx_year ON xisf_files(year, imagetyp)'),
+    # Partial index: only light frames are stored, so it stays small
+    ('idx_is_light_date', 'xisf_files',
+     'CREATE INDEX IF NOT EXISTS idx_is_light_date '
+     'ON xisf_files(is_light, date_loc) WHERE is_light = 1'),
+    # Covers the per-project filter goal aggregates (GROUP BY filter, and the
+    # catalog-wide GROUP BY project_id, filter) without touching the table;
+    # its project_id prefix also serves plain project_id lookups
+    ('idx_xisf_proj_filter', 'xisf_files',
+     'CREATE INDEX IF NOT EXISTS idx_xisf_proj_filter '
+     'ON xisf_files(project_id, filter, approval_status, imagetyp)'),
+    # Session lookups (assign/unassign/unassigned list) only ever look at
+    # light frames, so the partial index skips calibration frames entirely
+    ('idx_xisf_light_session', 'xisf_files',
+     'CREATE INDEX IF NOT EXISTS idx_xisf_light_session '
+     'ON xisf_files(date_loc, object, filter) '
+     'WHERE is_light = 1'),
+    # Catalog spelling of an object's filters, looked up by folded name;
+    # covers the per-object filter list too
+    ('idx_xisf_light_filter_key', 'xisf_files',
+     'CREATE INDEX IF NOT EXISTS idx_xisf_light_filter_key '
+     'ON xisf_files(object, filter_key, filter) '
+     'WHERE is_light = 1'),
+    # Approved-frame quality metrics per project
+    ('idx_xisf_proj_approval', 'xisf_files',
+     'CREATE INDEX IF NOT EXISTS idx_xisf_proj_approval '
+     'ON xisf_files(project_id, approval_status, filter)'),
+    # Unassigned-session list: only unassigned lights are indexed, in the
+    # list's ORDER BY order, so grouping and sorting stream from the index
+    ('idx_xisf_unassigned', 'xisf_files',
+     'CREATE INDEX IF NOT EXISTS idx_xisf_unassigned '
+     'ON xisf_files(date_loc DESC, object, filter) '
+     'WHERE project_id IS NULL AND is_light = 1'),
+    # Frame-kind equality lookups (calibration frames, per-project kinds)
+    ('idx_xisf_kind_project', 'xisf_files',
+     'CREATE INDEX IF NOT EXISTS idx_xisf_kind_project '
+     'ON xisf_files(frame_kind, project_id)'),
+    # Calibration frame matching. Partial on the generated frame_kind
+    # column: a query that filters on the same frame_kind equality can use
+    # the index, which a leading-wildcard imagetyp LIKE predicate never can.
+    ('idx_calibration_dark_kind', 'xisf_files',
+     'CREATE INDEX IF NOT EXISTS idx_calibration_dark_kind '
+     'ON xisf_files(exposure, ccd_temp, xbinning, ybinning, instrume) '
+     "WHERE frame_kind = 'D'"),
+    ('idx_calibration_flat_kind', 'xisf_files',
+     'CREATE INDEX IF NOT EXISTS idx_calibration_flat_kind '
+     'ON xisf_files(filter, date_loc, ccd_temp, xbinning, ybinning, instrume) '
+     "WHERE frame_kind = 'F'"),
+    ('idx_calibration_bias_kind', 'xisf_files',
+     'CREATE INDEX IF NOT EXISTS idx_calibration_bias_kind '
+     'ON xisf_files(ccd_temp, xbinning, ybinning, instrume) '
+     "WHERE frame_kind = 'B'"),
+    # Session assignment lookups by (date, object, filter)
+    ('idx_ps_session', 'project_sessions',
+     'CREATE INDEX IF NOT EXISTS idx_ps_session '
+     'ON project_sessions(date_loc, object_name, filter)'),
+]
+
+# Indexes that have been superseded and are removed during migration.
+OBSOLETE_INDEXES: List[str] = [
+    'idx_date_year',  # replaced by the indexed ``year`` column
+    'idx_xisf_session',  # replaced by idx_xisf_light_session (is_light predicate)
+    # replaced by the idx_calibration_*_kind indexes (frame_kind predicate)
+    'idx_calibration_darks',
+    'idx_calibration_flats',
+    'idx_calibration_bias',
+    'idx_project_id',  # a prefix of idx_xisf_proj_filter
+]
+
+# Goal counting rule shared by the count triggers: a frame counts towards
+# the goal of its project and filter unless it is a master frame. Approved
+# frames also count towards approved_count.
+_GOAL_DELTA_SQL = '''
+            UPDATE project_filter_goals
+            SET total_count = total_count {sign} 1,
+                approved_count = approved_count {sign} ({row}.approval_status IS 'approved'),
+                last_updated = CURRENT_TIMESTAMP
+            WHERE project_id = {row}.project_id
+            AND filter IS {row}.filter
+            AND {row}.imagetyp NOT LIKE '%Master%';
+'''
+
+# Goal metric rule: the averages cover the approved light frames of the
+# goal's project and filter that have been measured (hfd is set). {where}
+# selects the goals to refresh (aliased ``g``); goals without matching frames
+# get NULL averages and zero sums from the LEFT JOIN.
+_GOAL_METRICS_SQL = '''
+            UPDATE project_filter_goals
+            SET avg_hfd = m.avg_hfd,
+                avg_snr_weight = m.avg_snr_weight,
+                avg_roundness = m.avg_roundness,
+                avg_sky_flux = m.avg_sky_flux,
+                hfd_sum = m.hfd_sum,
+                hfd_count = m.hfd_count,
+                snr_weight_sum = m.snr_weight_sum,
+                snr_weight_count = m.snr_weight_count,
+                roundness_sum = m.roundness_sum,
+                roundness_count = m.roundness_count,
+                sky_flux_sum = m.sky_flux_sum,
+                sky_flux_count = m.sky_flux_count
+            FROM (
+                SELECT g.id AS goal_id,
+                       AVG(x.hfd) AS avg_hfd,
+                       AVG(x.snr_weight) AS avg_snr_weight,
+                       AVG(x.star_roundness) AS avg_roundness,
+                       AVG(x.sky_flux_mean) AS avg_sky_flux,
+                       TOTAL(x.hfd) AS hfd_sum,
+                       COUNT(x.hfd) AS hfd_count,
+                       TOTAL(x.snr_weight) AS snr_weight_sum,
+                       COUNT(x.snr_weight) AS snr_weight_count,
+                       TOTAL(x.star_roundness) AS roundness_sum,
+                       COUNT(x.star_roundness) AS roundness_count,
+                       TOTAL(x.sky_flux_mean) AS sky_flux_sum,
+                       COUNT(x.sky_flux_mean) AS sky_flux_count
+                FROM project_filter_goals g
+                LEFT JOIN xisf_files x
+                  ON x.project_id = g.project_id
+                 AND x.filter IS g.filter
+                 AND x.is_light = 1
+                 AND x.approval_status = 'approved'
+                 AND x.hfd IS NOT NULL
+                WHERE {where}
+                GROUP BY g.id
+            ) AS m
+            WHERE project_filter_goals.id = m.goal_id;
+'''
+
+# Refreshes the goal metrics of one project (bound parameter: project id)
+PROJECT_GOAL_METRICS_SQL = _GOAL_METRICS_SQL.format(where='g.project_id = ?')
+
+# Goal metric delta shared by the metric triggers: adds ({sign} '+') or
+# removes ({sign} '-') one frame's metrics from the running sums and counts
+# of its goal and re-derives the averages from them. SET expressions read
+# the row's values from before the UPDATE, so each average repeats its
+# sum and count delta. Frames outside the metric rule above change nothing.
+_GOAL_METRIC_DELTA_SQL = '''
+            UPDATE project_filter_goals
+            SET hfd_sum = hfd_sum {sign} IFNULL({row}.hfd, 0),
+                hfd_count = hfd_count {sign} ({row}.hfd IS NOT NULL),
+                avg_hfd = (hfd_sum {sign} IFNULL({row}.hfd, 0))
+                          / NULLIF(hfd_count {sign} ({row}.hfd IS NOT NULL), 0),
+                snr_weight_sum = snr_weight_sum {sign} IFNULL({row}.snr_weight, 0),
+                snr_weight_count = snr_weight_count {sign} ({row}.snr_weight IS NOT NULL),
+                avg_snr_weight = (snr_weight_sum {sign} IFNULL({row}.snr_weight, 0))
+                                 / NULLIF(snr_weight_count {sign} ({row}.snr_weight IS NOT NULL), 0),
+                roundness_sum = roundness_sum {sign} IFNULL({row}.star_roundness, 0),
+                roundness_count = roundness_count {sign} ({row}.star_roundness IS NOT NULL),
+                avg_roundness = (roundness_sum {sign} IFNULL({row}.star_roundness, 0))
+                                / NULLIF(roundness_count {sign} ({row}.star_roundness IS NOT NULL), 0),
+                sky_flux_sum = sky_flux_sum {sign} IFNULL({row}.sky_flux_mean, 0),
+                sky_flux_count = sky_flux_count {sign} ({row}.sky_flux_mean IS NOT NULL),
+                avg_sky_flux = (sky_flux_sum {sign} IFNULL({row}.sky_flux_mean, 0))
+                               / NULLIF(sky_flux_count {sign} ({row}.sky_flux_mean IS NOT NULL), 0)
+            WHERE project_id = {row}.project_id
+            AND filter IS {row}.filter
+            AND {row}.is_light = 1
+            AND {row}.approval_status IS 'approved'
+            AND {row}.hfd IS NOT NULL;
+'''
+
+# Triggers that keep the project tables consistent with xisf_files.
+# The xisf_files project columns are plain integers (SQLite cannot add a
+# foreign key to an existing table), so trg_projects_unlink_files plays the
+# role of ON DELETE SET NULL. The goal count triggers maintain
+# project_filter_goals.total_count/approved_count incrementally as frames
+# are linked, unlinked, re-graded or deleted, instead of recounting every
+# goal of a project after each change.
+TRIGGERS: List[Tuple[str, str]] = [
+    ('trg_projects_unlink_files', '''
+        CREATE TRIGGER IF NOT EXISTS trg_projects_unlink_files
+        AFTER DELETE ON projects
+        BEGIN
+            UPDATE xisf_files
+            SET project_id = NULL, session_assignment_id = NULL
+            WHERE project_id = OLD.id;
+        END
+    '''),
+    ('trg_xisf_goal_counts_insert', '''
+        CREATE TRIGGER IF NOT EXISTS trg_xisf_goal_counts_insert
+        AFTER INSERT ON xisf_files
+        WHEN NEW.project_id IS NOT NULL
+        BEGIN''' + _GOAL_DELTA_SQL.format(sign='+', row='NEW') + '''
+        END
+    '''),
+    ('trg_xisf_goal_counts_update', '''
+        CREATE TRIGGER IF NOT EXISTS trg_xisf_goal_counts_update
+        AFTER UPDATE OF project_id, filter, approval_status, imagetyp ON xisf_files
+        WHEN OLD.project_id IS NOT NEW.project_id
+          OR OLD.filter IS NOT NEW.filter
+          OR OLD.approval_status IS NOT NEW.approval_status
+          OR OLD.imagetyp IS NOT NEW.imagetyp
+        BEGIN''' + _GOAL_DELTA_SQL.format(sign='-', row='OLD')
+                 + _GOAL_DELTA_SQL.format(sign='+', row='NEW') + '''
+        END
+    '''),
+    ('trg_xisf_goal_counts_delete', '''
+        CREATE TRIGGER IF NOT EXISTS trg_xisf_goal_counts_delete
+        AFTER DELETE ON xisf_files
+        WHEN OLD.project_id IS NOT NULL
+        BEGIN''' + _GOAL_DELTA_SQL.format(sign='-', row='OLD') + '''
+        END
+    '''),
+    # Goal metrics only change when an approved frame is linked, unlinked,
+    # re-graded, re-measured or deleted; each change is applied as a delta
+    ('trg_xisf_goal_metric_delta_insert', '''
+        CREATE TRIGGER IF NOT EXISTS trg_xisf_goal_metric_delta_insert
+        AFTER INSERT ON xisf_files
+        WHEN NEW.project_id IS NOT NULL AND NEW.approval_status IS 'approved'
+        BEGIN''' + _GOAL_METRIC_DELTA_SQL.format(sign='+', row='NEW') + '''
+        END
+    '''),
+    ('trg_xisf_goal_metric_delta_update', '''
+        CREATE TRIGGER IF NOT EXISTS trg_xisf_goal_metric_delta_update
+        AFTER UPDATE OF project_id, filter, approval_status, imagetyp,
+                        hfd, snr_weight, star_roundness, sky_flux_mean ON xisf_files
+        WHEN (OLD.approval_status IS 'approved' OR NEW.approval_status IS 'approved')
+          AND (OLD.project_id IS NOT NULL OR NEW.project_id IS NOT NULL)
+          AND (OLD.project_id IS NOT NEW.project_id
+            OR OLD.filter IS NOT NEW.filter
+            OR OLD.approval_status IS NOT NEW.approval_status
+            OR OLD.imagetyp IS NOT NEW.imagetyp
+            OR OLD.hfd IS NOT NEW.hfd
+            OR OLD.snr_weight IS NOT NEW.snr_weight
+            OR OLD.star_roundness IS NOT NEW.star_roundness
+            OR OLD.sky_flux_mean IS NOT NEW.sky_flux_mean)
+        BEGIN''' + _GOAL_METRIC_DELTA_SQL.format(sign='-', row='OLD')
+                 + _GOAL_METRIC_DELTA_SQL.format(sign='+', row='NEW') + '''
+        END
+    '''),
+    ('trg_xisf_goal_metric_delta_delete', '''
+        CREATE TRIGGER IF NOT EXISTS trg_xisf_goal_metric_delta_delete
+        AFTER DELETE ON xisf_files
+        WHEN OLD.project_id IS NOT NULL AND OLD.approval_status IS 'approved'
+        BEGIN''' + _GOAL_METRIC_DELTA_SQL.format(sign='-', row='OLD') + '''
+        END
+    '''),
+    # A new goal starts from the frames already linked to its project
+    ('trg_goal_initial_counts', '''
+        CREATE TRIGGER IF NOT EXISTS trg_goal_initial_counts
+        AFTER INSERT ON project_filter_goals
+        BEGIN
+            UPDATE project_filter_goals
+            SET total_count = (
+                    SELECT COUNT(*) FROM xisf_files
+                    WHERE project_id = NEW.project_id
+                    AND filter IS NEW.filter
+                    AND imagetyp NOT LIKE '%Master%'),
+                approved_count = (
+                    SELECT COUNT(*) FROM xisf_files
+                    WHERE project_id = NEW.project_id
+                    AND filter IS NEW.filter
+                    AND imagetyp NOT LIKE '%Master%'
+                    AND approval_status = 'approved'),
+                last_updated = CURRENT_TIMESTAMP
+            WHERE id = NEW.id;
+        END
+    '''),
+    ('trg_goal_initial_metrics', '''
+        CREATE TRIGGER IF NOT EXISTS trg_goal_initial_metrics
+        AFTER INSERT ON project_filter_goals
+        BEGIN''' + _GOAL_METRICS_SQL.format(where='g.id = NEW.id') + '''
+        END
+    '''),
+]
+
+# Triggers that have been superseded and are removed during migration
+OBSOLETE_TRIGGERS: List[str] = [
+    # replaced by the trg_xisf_goal_metric_delta_* triggers, which apply
+    # deltas instead of re-averaging the whole goal for every changed row
+    'trg_xisf_goal_metrics_insert',
+    'trg_xisf_goal_metrics_update',
+    'trg_xisf_goal_metrics_delete',
+]
+
+# Tables the triggers reference; triggers are only installed once all exist
+_TRIGGER_TABLES = ('xisf_files', 'projects', 'project_filter_goals')
+
+# Every table ensure_schema upgrades
+_SCHEMA_TABLES = tuple(sorted(
+    {table_name for _, table_name, _ in QUERY_INDEXES} | set(_TRIGGER_TABLES)
+))
+
+# Full recount of every goal's frame counts: the frames are aggregated once
+# per (project, filter) and the totals joined onto every goal in a single
+# UPDATE ... FROM, instead of two correlated COUNTs per goal. The LEFT JOIN
+# resets goals without frames to zero.
+RESYNC_GOAL_COUNTS_SQL = '''
+    WITH agg AS (
+        SELECT project_id,
+               filter AS f,
+               COUNT(*) AS total,
+               SUM(CASE WHEN approval_status = 'approved' THEN 1 ELSE 0 END) AS approved
+        FROM xisf_files
+        WHERE project_id IS NOT NULL
+        AND imagetyp NOT LIKE '%Master%'
+        GROUP BY project_id, filter
+    )
+    UPDATE project_filter_goals
+    SET total_count = COALESCE(counts.total, 0),
+        approved_count = COALESCE(counts.approved, 0)
+    FROM (
+        SELECT g.id AS goal_id, agg.total, agg.approved
+        FROM project_filter_goals g
+        LEFT JOIN agg ON agg.project_id = g.project_id AND agg.f IS g.filter
+    ) AS counts
+    WHERE project_filter_goals.id = counts.goal_id
+'''
+
+# Refreshes the metrics of every goal
+RESYNC_GOAL_METRICS_SQL = _GOAL_METRICS_SQL.format(where='1')
+
+# Renames the filter goals of a catalog-wide filter rename (bound
+# parameters: new name, old name, new name) in one statement. Projects that
+# already have a goal for the new name keep both goals. The count and
+# metric triggers follow frames by filter name, so renamed goals must be
+# resynced afterwards.
+RENAME_GOAL_FILTER_SQL = '''
+    UPDATE project_filter_goals
+    SET filter = ?, last_updated = CURRENT_TIMESTAMP
+    WHERE filter = ?
+    AND NOT EXISTS (
+        SELECT 1 FROM project_filter_goals g
+        WHERE g.project_id = project_filter_goals.project_id
+        AND g.filter = ?
+    )
+'''
+
+# Full resync run once when the trigger named as key is first installed, so
+# databases upgraded from application-maintained values start in sync
+_TRIGGER_RESYNC_SQL: Dict[str, str] = {
+    'trg_xisf_goal_counts_update': RESYNC_GOAL_COUNTS_SQL,
+    'trg_xisf_goal_metric_delta_update': RESYNC_GOAL_METRICS_SQL,
+}
+
+
+def _table_exists(cursor, table_name: str) -> bool:
+    """
+    Check whether a table exists in the database.
+
+    Args:
+        cursor: An open sqlite3 cursor
+        table_name: Name of the table to look for
+
+    Returns:
+        True if the table exists, False otherwise
+    """
+    cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (table_name,)
+    )
+    return cursor.fetchone() is not None
+
+
+def ensure_derived_columns(cursor) -> None:
+    """
+    Ensure the generated columns exist on the ``xisf_files`` table.
+
+    Does nothing if the table has not been created yet.
+
+    Args:
+        cursor: An open sqlite3 cursor. The caller is responsible for
+                committing the connection.
+    """
+    if not _table_exists(cursor, 'xisf_files'):
+        return
+
+    cursor.execute("PRAGMA table_xinfo(xisf_files)")
+    existing_columns = {row[1] for row in cursor.fetchall()}
+
+    for column_name, column_def in DERIVED_COLUMNS.items():
+        if column_name not in existing_columns:
+            cursor.execute(
+                f"ALTER TABLE xisf_files ADD COLUMN {column_name} {column_def}"
+            )
+
+
+def ensure_goal_metric_columns(cursor) -> None:
+    """
+    Ensure the materialized metric columns exist on ``project_filter_goals``.
+
+    Does nothing if the table has not been created yet.
+
+    Args:
+        cursor: An open sqlite3 cursor. The caller is responsible for
+                committing the connection.
+    """
+    if not _table_exists(cursor, 'project_filter_goals'):
+        return
+
+    cursor.execute("PRAGMA table_info(project_filter_goals)")
+    existing_columns = {row[1] for row in cursor.fetchall()}
+
+    for column_name, column_def in GOAL_METRIC_COLUMNS.items():
+        if column_name not in existing_columns:
+            cursor.execute(
+                f"ALTER TABLE project_filter_goals ADD COLUMN {column_name} {column_def}"
+            )
+
+
+def ensure_query_indexes(cursor) -> bool:
+    """
+    Ensure the query-support indexes exist.
+
+    Indexes whose table has not been created yet are skipped; they are
+    picked up on a later call once the table exists.
+
+    Args:
+        cursor: An open sqlite3 cursor. The caller is responsible for
+                committing the connection.
+
+    Returns:
+        True if any index was created, False if all were already present
+    """
+    for index_name in OBSOLETE_INDEXES:
+        cursor.execute(f'DROP INDEX IF EXISTS {index_name}')
+
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    existing_indexes = {row[0] for row in cursor.fetchall()}
+
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    existing_tables = {row[0] for row in cursor.fetchall()}
+
+    created = False
+    for index_name, table_name, index_sql in QUERY_INDEXES:
+        if index_name not in existing_indexes and table_name in existing_tables:
+            cursor.execute(index_sql)
+            created = True
+    return created
+
+
+def ensure_triggers(cursor) -> None:
+    """
+    Ensure the consistency triggers exist.
+
+    Does nothing until ``xisf_files`` and the project tables exist.
+    Superseded triggers are dropped first.
+
+    Args:
+        cursor: An open sqlite3 cursor. The caller is responsible for
+                committing the connection.
+    """
+    if not all(_table_exists(cursor, name) for name in _TRIGGER_TABLES):
+        return
+
+    for trigger_name in OBSOLETE_TRIGGERS:
+        cursor.execute(f'DROP TRIGGER IF EXISTS {trigger_name}')
+
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+    existing_triggers = {row[0] for row in cursor.fetchall()}
+
+    for trigger_name, trigger_sql in TRIGGERS:
+        if trigger_name not in existing_triggers:
+            cursor.execute(trigger_sql)
+
+    for trigger_name, resync_sql in _TRIGGER_RESYNC_SQL.items():
+        if trigger_name not in existing_triggers:
+            cursor.execute(resync_sql)
+
+
+def ensure_schema(cursor) -> None:
+    """
+    Apply all idempotent schema upgrades in dependency order.
+
+    Does nothing if the database is already at SCHEMA_VERSION. Generated
+    and metric columns are added before the indexes and triggers that
+    reference them. When new indexes are created, or the database has never
+    been analyzed, the planner statistics are refreshed so the planner has
+    real row counts to choose between the indexes instead of guessing
+    selectivity.
+
+    Args:
+        cursor: An open sqlite3 cursor. The caller is responsible for
+                committing the connection.
+    """
+    cursor.execute('PRAGMA user_version')
+    if cursor.fetchone()[0] >= SCHEMA_VERSION:
+        return
+
+    ensure_derived_columns(cursor)
+    ensure_goal_metric_columns(cursor)
+    indexes_created = ensure_query_indexes(cursor)
+    if indexes_created or not _table_exists(cursor, 'sqlite_stat1'):
+        cursor.execute('ANALYZE')
+    ensure_triggers(cursor)
+
+    # Only record the version once every table was there to be upgraded;
+    # otherwise the skipped parts are picked up on a later call
+    if all(_table_exists(cursor, name) for name in _SCHEMA_TABLES):
+        cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')